@@ -1,7 +1,12 @@
 import google.generativeai as genai
-import faiss
 import numpy as np
 
+from answer_cache import SemanticAnswerCache
+from embedding_cache import get_cache
+from embedding_client import EmbeddingClient, genai_embed_batch
+from retriever import Retriever
+from bm25 import HybridRetriever
+
 # -----------------------------------
 # 1. CONFIGURE GEMINI API KEY
 # -----------------------------------
@@ -22,31 +27,52 @@ docs = [
 # -----------------------------------
 # 3. CREATE EMBEDDINGS FOR EACH DOCUMENT
 # -----------------------------------
-def embed_text(text):
+def _embed_text(text):
     return genai.embed_content(
         model="text-embedding-004",
         content=text
     )["embedding"]
 
-embeddings_list = [embed_text(d) for d in docs]
+# same text → served from the shared on-disk cache, no API call
+embed_text = get_cache().cached("text-embedding-004", _embed_text)
+
+# documents → batched + concurrent requests instead of one call per doc
+doc_client = EmbeddingClient(
+    genai_embed_batch("text-embedding-004"),
+    cache=get_cache(), model="text-embedding-004"
+)
+embeddings_list = doc_client.embed(docs)
 
 
 # -----------------------------------
 # 4. STORE EMBEDDINGS IN FAISS INDEX
 # -----------------------------------
-dimension = len(embeddings_list[0])            # size of embedding
-index = faiss.IndexFlatL2(dimension)           # create FAISS index
-index.add(np.array(embeddings_list).astype('float32'))  # add vectors
+INDEX_CONFIG = {"type": "flat"}                # or ivf_flat / hnsw / ivf_pq
+retriever = Retriever(INDEX_CONFIG)            # create FAISS index
+retriever.build(np.array(embeddings_list))     # train (if needed) + add vectors
 
 
 # -----------------------------------
 # 5. USER QUERY → FIND SIMILAR DOCS
 # -----------------------------------
+query_vectors = {}    # query text → embedding, shared with the answer cache
+
+def query_vector(text):
+    if text not in query_vectors:
+        query_vectors[text] = np.array([embed_text(text)]).astype('float32')
+    return query_vectors[text]
+
+def dense_search(text, k):
+    # only called when the hybrid retriever decides it needs embeddings
+    distances, positions = retriever.search(query_vector(text), k)
+    return [i for i in positions[0] if i != -1]
+
+hybrid = HybridRetriever(docs, dense_search)   # BM25 + FAISS, fused with RRF
+
 query = "delivery problems"
-query_emb = np.array([embed_text(query)]).astype('float32')
 
 k = 2                                          # return top 2 matches
-distances, positions = index.search(query_emb, k)
+positions = [hybrid.search(query, k)]          # dense="auto" → skipped for cheap keyword queries
 
 print("Top matched document indexes:", positions)
 print()
@@ -65,18 +91,27 @@ print()
 # -----------------------------------
 model = genai.GenerativeModel("gemini-2.0-pro")
 
-prompt = f"""
+PROMPT_TEMPLATE = """
 Using ONLY the information below, answer the question:
 
 Context:
-{retrieved_docs}
+{context}
 
 Question:
 What issues are customers facing?
 
 """
 
-response = model.generate_content(prompt)
+# same / near-identical query over the same docs → cached answer, no LLM call
+answers = SemanticAnswerCache(threshold=0.95, ttl=3600, path="answer_cache.pkl")
+
+# query vector is passed lazily: reused from the dense search if it ran,
+# not computed at all when the same query text is already cached
+answer = answers.get_or_generate(
+    lambda: query_vector(query), positions[0], PROMPT_TEMPLATE,
+    lambda: model.generate_content(PROMPT_TEMPLATE.format(context=retrieved_docs)).text,
+    query_text=query,
+)
 
 print("Final Answer from Gemini:\n")
-print(response.text)
+print(answer)
@@ -1,8 +1,12 @@
 import google.generativeai as genai
 genai.configure(api_key="YOUR_KEY")
-import faiss
 import numpy as np
 
+from answer_cache import SemanticAnswerCache
+from embedding_cache import get_cache
+from embedding_client import EmbeddingClient, genai_embed_batch
+from vector_store import PersistentIndex
+
 # step :1
 # Load docs
 docs = [
@@ -15,40 +19,51 @@ docs = [
 
 # step :2
 # Generate embeddings
-def embed_text(text):
+def _embed_text(text):
     return genai.embed_content(
         model="text-embedding-004",
         content=text
     )["embedding"]
 
-embeddings = [embed_text(d) for d in docs]
-
+# same text → served from the shared on-disk cache, no API call
+embed_text = get_cache().cached("text-embedding-004", _embed_text)
 
 # step :3
-# Store in FAISS
-dimension = len(embeddings[0])
-index = faiss.IndexFlatL2(dimension)
+# Store in FAISS (saved on disk, only new/changed docs get embedded)
+store = PersistentIndex("rag_tutorial_store")
 #  L2 → uses Euclidean distance to compare vectors → simple index, no training
-# dimension → tells FAISS each vector has this many numbers
-index.add(np.array(embeddings).astype('float32')) 
+# content hash of each doc → decides if it needs a new embedding,
+# docs no longer in the list (incl. the old text of edited ones) are removed
+doc_client = EmbeddingClient(
+    genai_embed_batch("text-embedding-004"),
+    cache=get_cache(), model="text-embedding-004"
+)
+if store.add_documents(docs, doc_client.embed):
+    store.save()
 
 # step :4 
 # Query
 query = "delivery issues"
 q_emb = np.array([embed_text(query)]).astype('float32')
 
-distance, position = index.search(q_emb, 2)
-print("Matches:", position)
+distance, matches = store.search(q_emb, 2)
+print("Matches:", [m["text"] for m in matches[0]])
 
 
 # step :5 Send retrieved docs to Gemini
 
 model = genai.GenerativeModel("gemini-2.0-pro")
 
-context = "\n".join([docs[i] for i in position[0]])
+context = "\n".join([m["text"] for m in matches[0]])
+
+PROMPT_TEMPLATE = "Using this data:\n{context}\n\nAnswer: What issues are customers facing?"
+
+# repeated question over the same docs → answer from cache, no LLM call
+answers = SemanticAnswerCache(threshold=0.95, ttl=3600, path="answer_cache.pkl")
 
-response = model.generate_content(
-    f"Using this data:\n{context}\n\nAnswer: What issues are customers facing?"
+answer = answers.get_or_generate(
+    q_emb, [m["id"] for m in matches[0]], PROMPT_TEMPLATE,
+    lambda: model.generate_content(PROMPT_TEMPLATE.format(context=context)).text
 )
 
-print(response.text)
+print(answer)
@@ -1,8 +1,16 @@
+import io
+import os
+import json
+import hashlib
 import streamlit as st
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 import google.generativeai as genai
 
+from embedding_cache import get_cache
+from embedding_client import EmbeddingClient, genai_embed_batch
+from similarity_search import CosineSearch
+
 
 # -------------------------
 # CONFIG
@@ -14,12 +22,15 @@ EMBED_MODEL = "text-embedding-004"
 # -------------------------
 # FUNCTION: Get Embedding
 # -------------------------
-def get_embedding(text):
+def _get_embedding(text):
     return genai.embed_content(
         model=EMBED_MODEL,
         content=text
     )["embedding"]
 
+# cached by (model, text hash) → re-uploads of the same CSV cost nothing
+get_embedding = get_cache().cached(EMBED_MODEL, _get_embedding)
+
 
 # -------------------------
 # STREAMLIT UI
@@ -28,47 +39,115 @@ st.title("🔍 Semantic Search: Customer Feedback Analysis")
 st.write("Find similar feedback using **Gemini Embeddings**.")
 
 
+# -------------------------
+# CACHED PER UPLOADED FILE
+# st.cache_resource → survives reruns (every keystroke) and is shared by
+# all sessions; the .npy copy on disk survives app restarts
+# -------------------------
+EMBED_DIR = "embeddings_cache"
+
+doc_client = EmbeddingClient(
+    genai_embed_batch(EMBED_MODEL), cache=get_cache(), model=EMBED_MODEL
+)
+
+
+def file_hash(data):
+    return hashlib.sha256(EMBED_MODEL.encode() + data).hexdigest()
+
+
+@st.cache_resource(show_spinner=False, max_entries=20)
+def load_feedback_file(key, _data):
+    return pd.read_csv(io.BytesIO(_data))
+
+
+@st.cache_resource(show_spinner="Generating embeddings... (only once per file)", max_entries=20)
+def load_search_engine(key, _df):
+    path = os.path.join(EMBED_DIR, f"{key}.npy")
+
+    if os.path.exists(path):
+        embeddings = np.load(path, mmap_mode="r")
+    elif "embedding" in _df.columns:
+        # embeddings already in the CSV (stored as JSON lists)
+        embeddings = np.array([json.loads(e) if isinstance(e, str) else e for e in _df["embedding"]],
+                              dtype="float32")
+    else:
+        embeddings = np.array(doc_client.embed(_df["feedback"].astype(str).tolist()), dtype="float32")
+        os.makedirs(EMBED_DIR, exist_ok=True)
+        np.save(path, embeddings)
+
+    return CosineSearch(embeddings)
+
+
 # ---- Upload CSV ----
 uploaded_file = st.file_uploader("Upload CSV with a column named 'feedback'", type=["csv"])
 
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
+    data = uploaded_file.getvalue()
+    key = file_hash(data)
+    df = load_feedback_file(key, data)
 
     if "feedback" not in df.columns:
         st.error("CSV must contain a 'feedback' column!")
     else:
         st.success("CSV uploaded successfully!")
 
-        # Generate embeddings if not present
-        if "embedding" not in df.columns:
-            st.info("Generating embeddings... (only once)")
-            df["embedding"] = df["feedback"].apply(get_embedding)
-            st.success("Embeddings generated!")
-
-        st.write("### 📝 Input your search query")
-        query = st.text_input("Enter text (Example: 'delivery issues')")
-
-        if query:
-            q_emb = get_embedding(query)
-
-            # Similarity scores
-            df["similarity"] = df["embedding"].apply(
-                lambda x: cosine_similarity([x], [q_emb])[0][0]
-            )
-
-            # Sort by similarity
-            results = df.sort_values("similarity", ascending=False)
-
-            st.write("### 📊 Top Matches")
-            st.dataframe(
-                results[["feedback", "similarity"]]
-                .style.background_gradient(cmap="Greens")
-            )
-
-            # Expand embeddings
-            st.write("### 🔍 Detailed Results")
-            for i, row in results.iterrows():
-                with st.expander(f"{row['feedback']} (similarity: {row['similarity']:.3f})"):
-                    st.write(row["embedding"])
+        engine = load_search_engine(key, df)
+
+        mode = st.radio("Search mode", ["Single query", "Batch queries"], horizontal=True)
+
+        if mode == "Single query":
+            st.write("### 📝 Input your search query")
+            query = st.text_input("Enter text (Example: 'delivery issues')")
+
+            top_k = st.number_input("Number of matches", 1, len(df), min(10, len(df)))
+
+            if query:
+                # a new query costs one query embedding + one matmul
+                q_emb = get_embedding(query)
+                idx, sims = engine.search(q_emb, top_k)
+
+                results = df.iloc[idx].copy()
+                results["similarity"] = sims
+
+                st.write("### 📊 Top Matches")
+                st.dataframe(
+                    results[["feedback", "similarity"]]
+                    .style.background_gradient(cmap="Greens")
+                )
+
+                # Expand embeddings
+                st.write("### 🔍 Detailed Results")
+                for i, (_, row) in zip(idx, results.iterrows()):
+                    with st.expander(f"{row['feedback']} (similarity: {row['similarity']:.3f})"):
+                        st.write(engine.matrix[i])
+
+        else:
+            # ---- many queries: batched embedding + matrix-matrix scoring ----
+            st.write("### 📝 Paste one query per line")
+            text = st.text_area("Queries (Example: complaint themes)", height=200)
+            top_k = st.number_input("Matches per query", 1, len(df), min(5, len(df)))
+
+            queries = [q.strip() for q in text.splitlines() if q.strip()]
+
+            if queries and st.button(f"Search {len(queries)} queries"):
+                q_embs = doc_client.embed(queries)         # a few batched API calls
+
+                out = io.StringIO()
+                out.write("query,rank,feedback,similarity\n")
+                progress = st.progress(0.0)
+
+                # scored tile by tile → memory bounded however many queries
+                for start, idx, sims in engine.iter_search_batch(q_embs, top_k):
+                    rows = [
+                        (queries[start + r], rank + 1, df["feedback"].iat[i], s)
+                        for r in range(len(idx))
+                        for rank, (i, s) in enumerate(zip(idx[r], sims[r]))
+                    ]
+                    pd.DataFrame(rows).to_csv(out, header=False, index=False)
+                    progress.progress(min(1.0, (start + len(idx)) / len(queries)))
+
+                st.success(f"Scored {len(queries)} queries against {len(df)} rows")
+                st.download_button("⬇️ Download results CSV", out.getvalue(),
+                                   file_name="batch_search_results.csv", mime="text/csv")
 else:
     st.info("Upload a CSV file to begin.")
@@ -0,0 +1,131 @@
+import os
+import time
+import pickle
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+# -----------------------------------
+# Semantic answer cache in front of generate_content
+#
+# an answer is reused when
+#   same retrieved doc-id set  +  same prompt template
+#   and (same query text  or  query embedding cosine ≥ threshold)
+#   and entry is younger than ttl
+# size bounded → least recently used entries are evicted
+#
+# query_vector may be a zero-argument function → the query is only
+# embedded when an exact text match is not enough
+# -----------------------------------
+
+
+def template_hash(template):
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+def _unit(v):
+    if callable(v):
+        v = v()
+    v = np.asarray(v, dtype="float32").ravel()
+    n = np.linalg.norm(v)
+    return v / n if n else v
+
+
+class SemanticAnswerCache:
+
+    def __init__(self, threshold=0.95, ttl=3600, max_entries=1000, path=None):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+
+        # (doc-id set, template hash) → OrderedDict(entry id → entry)
+        self.groups = {}
+        self.lru = OrderedDict()          # entry id → group key
+        self.next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def _key(self, doc_ids, template):
+        return frozenset(str(d) for d in doc_ids), template_hash(template)
+
+    def _drop(self, entry_id):
+        key = self.lru.pop(entry_id)
+        group = self.groups[key]
+        del group[entry_id]
+        if not group:
+            del self.groups[key]
+
+    def get(self, query_vector, doc_ids, template, query_text=None):
+        key = self._key(doc_ids, template)
+        group = self.groups.get(key)
+        now = time.time()
+
+        if group:
+            for entry_id in [e for e, entry in group.items() if now - entry["time"] > self.ttl]:
+                self._drop(entry_id)
+            group = self.groups.get(key)
+
+        if group and query_text is not None:
+            for entry_id, entry in group.items():
+                if entry.get("text") == query_text:
+                    self.hits += 1
+                    self.lru.move_to_end(entry_id)
+                    return entry["answer"]
+
+        if group:
+            ids = list(group)
+            matrix = np.stack([group[e]["vector"] for e in ids])
+            sims = matrix @ _unit(query_vector)
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                self.hits += 1
+                self.lru.move_to_end(ids[best])
+                return group[ids[best]]["answer"]
+
+        self.misses += 1
+        return None
+
+    def put(self, query_vector, doc_ids, template, answer, query_text=None):
+        key = self._key(doc_ids, template)
+        entry_id = self.next_id
+        self.next_id += 1
+
+        self.groups.setdefault(key, OrderedDict())[entry_id] = {
+            "vector": _unit(query_vector),
+            "text": query_text,
+            "answer": answer,
+            "time": time.time(),
+        }
+        self.lru[entry_id] = key
+
+        while len(self.lru) > self.max_entries:
+            self._drop(next(iter(self.lru)))
+
+        if self.path:
+            self.save(self.path)
+
+    def get_or_generate(self, query_vector, doc_ids, template, generate_fn, query_text=None):
+        answer = self.get(query_vector, doc_ids, template, query_text)
+        if answer is None:
+            answer = generate_fn()
+            self.put(query_vector, doc_ids, template, answer, query_text)
+        return answer
+
+    # ---- persistence (so plain scripts keep answers between runs) ----
+    def save(self, path):
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((self.groups, self.lru, self.next_id), f)
+        os.replace(path + ".tmp", path)
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            self.groups, self.lru, self.next_id = pickle.load(f)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.lru)}
@@ -0,0 +1,84 @@
+import time
+import argparse
+import numpy as np
+
+from retriever import Retriever
+
+
+# -----------------------------------
+# recall@k vs latency: ANN index modes against the flat baseline
+#
+#   python benchmark_retriever.py --n 200000 --dim 256
+# -----------------------------------
+
+
+def synthetic_corpus(n, dim, n_queries, seed=0):
+    # clustered data → closer to real embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((256, dim)).astype("float32")
+    labels = rng.integers(0, len(centers), n + n_queries)
+    data = centers[labels] + 0.3 * rng.standard_normal((n + n_queries, dim)).astype("float32")
+    return data[:n], data[n:]
+
+
+def recall_at_k(found, truth, k):
+    hits = sum(len(set(f[:k]) & set(t[:k])) for f, t in zip(found, truth))
+    return hits / (len(truth) * k)
+
+
+def latency_ms(retriever, queries, k):
+    # one query at a time, like a live request
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        retriever.search(q, k)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    data, queries = synthetic_corpus(args.n, args.dim, args.queries)
+    # 4·sqrt(n) cells, capped so every cell gets the ~39 training points
+    # faiss wants — otherwise build_index silently falls back to flat
+    nlist = max(1, min(int(4 * np.sqrt(args.n)), args.n // 39))
+
+    flat = Retriever(type="flat").build(data)
+    _, truth = flat.search(queries, args.k)
+
+    runs = [("flat", {"type": "flat"}, [None])]
+    runs.append(("ivf_flat", {"type": "ivf_flat", "nlist": nlist}, [1, 8, 32]))
+    runs.append(("hnsw", {"type": "hnsw"}, [16, 64, 256]))
+    runs.append(("ivf_pq", {"type": "ivf_pq", "nlist": nlist, "pq_m": args.dim // 8}, [8, 32]))
+
+    print(f"corpus={args.n} dim={args.dim} queries={args.queries} k={args.k} nlist={nlist}\n")
+    print(f"{'index':<10}{'built as':>16}{'param':>10}{'build s':>10}{'recall@k':>10}"
+          f"{'p50 ms':>10}{'p99 ms':>10}")
+
+    for name, config, params in runs:
+        start = time.perf_counter()
+        r = Retriever(config).build(data)
+        build = time.perf_counter() - start
+        built_as = type(r.index).__name__       # shows a fallback to IndexFlatL2
+
+        for p in params:
+            if name == "hnsw":
+                r.tune(ef_search=p)
+            elif p is not None:
+                r.tune(nprobe=p)
+
+            _, found = r.search(queries, args.k)
+            p50, p99 = latency_ms(r, queries, args.k)
+            label = "-" if p is None else p
+            print(f"{name:<10}{built_as:>16}{label:>10}{build:>10.1f}{recall_at_k(found, truth, args.k):>10.3f}"
+                  f"{p50:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
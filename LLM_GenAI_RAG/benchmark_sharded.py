@@ -0,0 +1,67 @@
+import os
+import time
+import argparse
+import multiprocessing as mp
+
+import numpy as np
+
+from sharded_search import ShardedSearcher
+
+
+# -----------------------------------
+# Throughput of sharded search vs. number of shards
+#
+#   python benchmark_sharded.py --n 10000000 --dim 64
+#
+# synthetic vectors are written once to a .npy file (memory-mapped by
+# every worker), then the same query batch is timed for 1, 2, 4 … shards
+# -----------------------------------
+
+
+def write_corpus(path, n, dim, block=1_000_000, seed=0):
+    if os.path.exists(path) and np.load(path, mmap_mode="r").shape == (n, dim):
+        return
+    rng = np.random.default_rng(seed)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype="float32", shape=(n, dim))
+    for s in range(0, n, block):
+        e = min(s + block, n)
+        out[s:e] = rng.standard_normal((e - s, dim), dtype="float32")
+    out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2_000_000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--path", default="synthetic_vectors.npy")
+    args = parser.parse_args()
+
+    write_corpus(args.path, args.n, args.dim)
+    queries = np.random.default_rng(1).standard_normal((args.queries, args.dim), dtype="float32")
+
+    shard_counts = sorted({1, 2, 4, 8, mp.cpu_count()} & set(range(1, mp.cpu_count() + 1)))
+    print(f"corpus={args.n} dim={args.dim} queries={args.queries} cores={mp.cpu_count()}\n")
+    print(f"{'shards':>6}{'seconds':>10}{'QPS':>10}{'speedup':>10}")
+
+    baseline, truth = None, None
+    for n_shards in shard_counts:
+        with ShardedSearcher(args.path, n_shards) as searcher:
+            searcher.search(queries[:4], args.k)              # warm-up
+            start = time.perf_counter()
+            D, I = searcher.search(queries, args.k)
+            elapsed = time.perf_counter() - start
+
+        if truth is None:
+            truth = I
+        else:
+            # every shard count must return the same neighbours
+            assert (I == truth).mean() > 0.999
+
+        baseline = baseline or elapsed
+        print(f"{n_shards:>6}{elapsed:>10.2f}{args.queries / elapsed:>10.1f}{baseline / elapsed:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+
+# -----------------------------------
+# BM25 keyword retrieval + hybrid (BM25 + dense) search
+#
+# inverted index stored CSR-style (no per-term Python lists):
+#   offsets[t] : offsets[t+1]  → slice of postings for term t
+#   doc_ids / tfs              → int32 / uint16 arrays
+# IDF per term is precomputed at build time
+# -----------------------------------
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+
+    def __init__(self, docs, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = len(docs)
+
+        counts = [Counter(tokenize(d)) for d in docs]
+        self.doc_len = np.array([sum(c.values()) for c in counts], dtype="float32")
+        self.avg_len = float(self.doc_len.mean()) if self.n_docs else 0.0
+
+        self.vocab = {}
+        postings = {}
+        for doc_id, c in enumerate(counts):
+            for term, tf in c.items():
+                t = self.vocab.setdefault(term, len(self.vocab))
+                postings.setdefault(t, []).append((doc_id, tf))
+
+        self.offsets = np.zeros(len(self.vocab) + 1, dtype="int64")
+        for t in range(len(self.vocab)):
+            self.offsets[t + 1] = self.offsets[t] + len(postings[t])
+
+        self.doc_ids = np.empty(self.offsets[-1], dtype="int32")
+        self.tfs = np.empty(self.offsets[-1], dtype="uint16")
+        for t, plist in postings.items():
+            s, e = self.offsets[t], self.offsets[t + 1]
+            self.doc_ids[s:e] = [d for d, _ in plist]
+            self.tfs[s:e] = [min(tf, 65535) for _, tf in plist]
+
+        df = np.diff(self.offsets).astype("float32")
+        self.idf = np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+        # length normalization part of the BM25 denominator, per doc
+        self._norm = k1 * (1 - b + b * self.doc_len / max(self.avg_len, 1e-9))
+
+    def scores(self, query):
+        s = np.zeros(self.n_docs, dtype="float32")
+        for term in set(tokenize(query)):
+            t = self.vocab.get(term)
+            if t is None:
+                continue
+            lo, hi = self.offsets[t], self.offsets[t + 1]
+            docs = self.doc_ids[lo:hi]
+            tf = self.tfs[lo:hi].astype("float32")
+            s[docs] += self.idf[t] * tf * (self.k1 + 1) / (tf + self._norm[docs])
+        return s
+
+    def search(self, query, k=10):
+        """(doc positions, scores) best first; docs with score 0 are left out."""
+        s = self.scores(query)
+        hits = np.flatnonzero(s)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-s[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-s[hits])]
+        return hits, s[hits]
+
+
+def reciprocal_rank_fusion(rankings, k=60, weights=None):
+    """rankings: lists of doc positions, best first → fused list, best first."""
+    fused = {}
+    for r, ranking in enumerate(rankings):
+        w = 1.0 if weights is None else weights[r]
+        for rank, doc in enumerate(ranking):
+            fused[int(doc)] = fused.get(int(doc), 0.0) + w / (k + rank + 1)
+    return sorted(fused, key=fused.get, reverse=True)
+
+
+class HybridRetriever:
+
+    def __init__(self, docs, dense_search, bm25=None, rrf_k=60):
+        # dense_search(query_text, k) → doc positions, best first
+        self.docs = docs
+        self.dense_search = dense_search
+        self.bm25 = bm25 or BM25Index(docs)
+        self.rrf_k = rrf_k
+
+    def is_cheap(self, query, max_terms=3):
+        # short query whose words all exist in the corpus → keywords are enough
+        terms = tokenize(query)
+        return 0 < len(terms) <= max_terms and all(t in self.bm25.vocab for t in terms)
+
+    def search(self, query, k=5, dense="auto"):
+        """
+        dense=True  → BM25 + dense fused with RRF
+        dense=False → BM25 only (no embedding call, no vector search)
+        dense="auto"→ skip dense for cheap keyword queries
+        """
+        lexical, _ = self.bm25.search(query, k * 2)
+
+        if dense == "auto":
+            dense = not (self.is_cheap(query) and len(lexical) >= k)
+        if not dense:
+            return lexical[:k].tolist()
+
+        semantic = self.dense_search(query, k * 2)
+        return reciprocal_rank_fusion([lexical, semantic], self.rrf_k)[:k]
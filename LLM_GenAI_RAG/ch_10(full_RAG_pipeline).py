@@ -1,6 +1,9 @@
 from google import genai
 import numpy as np
-import faiss
+
+from answer_cache import SemanticAnswerCache
+from context_builder import build_context
+from versioned_store import VersionedStore
 
 client = genai.Client(api_key="YOUR_GEMINI_API_KEY")
 
@@ -12,20 +15,27 @@ documents = [
 ]
 
 
-embed_response = client.models.embed_content(
-    model="models/text-embedding-004",
-    contents=documents
-)
+def embed_documents(texts):
+    embed_response = client.models.embed_content(
+        model="models/text-embedding-004",
+        contents=texts
+    )
+    return [e.values for e in embed_response.embeddings]
 
-embeddings = np.array([e.values for e in embed_response.embeddings])
 
+# index lives on disk → only new / changed docs are embedded on each run;
+# edited docs get a new version, old versions + removed docs are tombstoned.
+# own store: the docs below are the whole corpus here, unlike rag_store
+# (ingest.py / rag_server.py), so anything not listed can be deleted
+store = VersionedStore("ch10_store", compact_threshold=0.2)
+doc_ids = [f"doc-{i}" for i in range(len(documents))]
 
-dimension = embeddings.shape[1]
+added = store.add_documents(documents, embed_documents, ids=doc_ids)
+removed = store.delete(set(store.by_doc_id) - set(doc_ids))
+if added or removed:
+    store.save()
 
-index = faiss.IndexFlatL2(dimension)
-index.add(embeddings)
-
-print("Vectors stored:", index.ntotal)
+print("Vectors stored:", store.live_count, "(new:", added, ", removed:", removed, ")")
 
 user_query = "What is RAG and why is it useful?"
 
@@ -36,18 +46,23 @@ query_embedding = client.models.embed_content(
 
 query_vector = np.array([query_embedding.embeddings[0].values])
 
-D, I = index.search(query_vector, k=2)
-
+# retrieve a wider candidate set, then keep only what fits the token budget
+D, matches = store.search(query_vector, k=8)
 
-retrieved_docs = [documents[i] for i in I[0]]
-
-context = "\n".join(retrieved_docs)
+candidates = matches[0]
+context, context_stats = build_context(
+    query_vector,
+    [doc["text"] for doc in candidates],
+    store.get_vectors([doc["fid"] for doc in candidates]),
+    token_budget=1500,
+)
+used_docs = [candidates[i] for i in context_stats["picked"]]
 
 print("Retrieved context:")
 print(context)
 
 
-prompt = f"""
+PROMPT_TEMPLATE = """
 You are an AI assistant.
 Answer ONLY using the context below.
 If answer is not present, say "I don't know".
@@ -56,14 +71,29 @@ Context:
 {context}
 
 Question:
-{user_query}
+{question}
 """
 
-
-for chunk in client.models.generate_content_stream(
-    model="models/gemini-flash-latest",
-    contents=prompt
-):
-    print(chunk.text, end="")
-
-
+prompt = PROMPT_TEMPLATE.format(context=context, question=user_query)
+
+
+# same / near-identical question over the same docs → cached answer, no LLM call
+answers = SemanticAnswerCache(threshold=0.95, ttl=3600, path="answer_cache.pkl")
+used_ids = [doc["id"] for doc in used_docs]
+
+cached = answers.get(query_vector, used_ids, PROMPT_TEMPLATE)
+if cached is not None:
+    print(cached, end="")
+else:
+    parts = []
+    for chunk in client.models.generate_content_stream(
+        model="models/gemini-flash-latest",
+        contents=prompt
+    ):
+        if chunk.text:      # some chunks (e.g. the final one) carry no text
+            print(chunk.text, end="")
+            parts.append(chunk.text)
+    answers.put(query_vector, used_ids, PROMPT_TEMPLATE, "".join(parts))
+
+# background compaction may still be saving the store → let it finish
+store.wait_for_compaction()
@@ -1,7 +1,8 @@
 import os
 from google import genai
 import numpy as np
-import faiss
+
+from retriever import Retriever
 
 client = genai.Client(
     api_key=os.getenv("GEMINI_API_KEY")
@@ -23,12 +24,12 @@ embeddings = np.array([e.values for e in response.embeddings])
 print(embeddings.shape)  # (3, embedding_dimension)
 
 
-dimension = embeddings.shape[1]
+# "flat" is exact; for big corpora switch to "ivf_flat" / "hnsw" / "ivf_pq"
+INDEX_CONFIG = {"type": "flat", "nprobe": 16, "ef_search": 64}
 
-index = faiss.IndexFlatL2(dimension)
-index.add(embeddings)
+retriever = Retriever(INDEX_CONFIG).build(embeddings)
 
-print("Total vectors stored:", index.ntotal)
+print("Total vectors stored:", retriever.ntotal)
 
 query = "What is a vector database?"
 
@@ -39,7 +40,7 @@ query_embedding = client.models.embed_content(
 
 query_vector = np.array([query_embedding.embeddings[0].values])
 
-D, I = index.search(query_vector, k=2)
+D, I = retriever.search(query_vector, k=2)
 
 print("Best matches:", I)
 
@@ -62,4 +63,6 @@ Similarity search
    ↓
 Send relevant text to LLM
 
+ingest.py does the first four steps for real PDFs / CSVs:
+python ingest.py report.pdf --store rag_store --max-tokens 400 --overlap 50
 """
\ No newline at end of file
@@ -1,16 +1,30 @@
 import google.generativeai as genai
-import pandas as pd
 import os
 
+from csv_loader import load_csv
+from pandas_qa import answer_question
+
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 model = genai.GenerativeModel("models/gemini-pro-latest")
 
-df = pd.read_csv("/Users/tayyabkhan/Downloads/sales_data_sample.csv", encoding='latin1')
+# parsed once into a memory-mapped columnar cache, later runs skip the CSV parser
+df = load_csv("/Users/tayyabkhan/Downloads/sales_data_sample.csv", encoding='latin1')
 
 question = "Which region has highest revenue?"
 
-response = model.generate_content(
-    f"Answer this using the dataset:\n{df.head().to_string()}\nQuestion: {question}"
-)
+# "plan" → model writes a groupby/filter/sort plan, pandas runs it on ALL rows,
+#          model only sees the small result (same token cost for any file size)
+# "head" → paste the first rows into the prompt (old behaviour)
+MODE = "plan"
+
+if MODE == "plan":
+    answer, plan, result = answer_question(
+        df, question, lambda prompt: model.generate_content(prompt).text
+    )
+    print(answer)
+else:
+    response = model.generate_content(
+        f"Answer this using the dataset:\n{df.head().to_string()}\nQuestion: {question}"
+    )
 
-print(response.text)
+    print(response.text)
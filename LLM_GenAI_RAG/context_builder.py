@@ -0,0 +1,88 @@
+import numpy as np
+
+from ingest import count_tokens
+
+
+# -----------------------------------
+# Query-time context budgeter
+#
+#   candidates (retrieved chunks + their vectors)
+#   → re-rank by relevance to the query
+#   → MMR: pick relevant chunks that are NOT near-copies of picked ones
+#   → pack into a token budget
+#   → print how many tokens the query saved vs. sending everything
+# -----------------------------------
+
+
+def _unit_rows(x):
+    x = np.asarray(x, dtype="float32")
+    if x.ndim == 1:
+        x = x[None, :]
+    n = np.linalg.norm(x, axis=1, keepdims=True)
+    n[n == 0] = 1.0
+    return x / n
+
+
+def mmr_order(query_vector, vectors, lambda_mult=0.7, dedup_threshold=0.95, scores=None):
+    """
+    Maximal Marginal Relevance order of candidate indices.
+    scores → optional relevance per candidate (e.g. from a re-ranker),
+    defaults to cosine with the query. Near-duplicates are dropped.
+    """
+    V = _unit_rows(vectors)
+    relevance = V @ _unit_rows(query_vector)[0] if scores is None else np.asarray(scores, dtype="float32")
+    pairwise = V @ V.T
+
+    chosen = []
+    remaining = list(np.argsort(-relevance))
+    max_sim = np.full(len(V), -np.inf, dtype="float32")
+
+    while remaining:
+        if chosen:
+            mmr = lambda_mult * relevance[remaining] - (1 - lambda_mult) * max_sim[remaining]
+            best = remaining[int(np.argmax(mmr))]
+        else:
+            best = remaining[0]
+        remaining.remove(best)
+
+        if chosen and max_sim[best] >= dedup_threshold:
+            continue                    # near-identical to something already picked
+        chosen.append(best)
+        max_sim = np.maximum(max_sim, pairwise[best])
+
+    return chosen
+
+
+def build_context(query_vector, texts, vectors, token_budget=1500, lambda_mult=0.7,
+                  dedup_threshold=0.95, scores=None, separator="\n", verbose=True):
+    """
+    Returns (context string, stats dict).
+    Chunks are taken in MMR order; a chunk that does not fit the remaining
+    budget is skipped so a smaller, later one can still use the space.
+    """
+    order = mmr_order(query_vector, vectors, lambda_mult, dedup_threshold, scores)
+    sizes = [count_tokens(t) for t in texts]
+
+    picked, used = [], 0
+    for i in order:
+        if used + sizes[i] <= token_budget:
+            picked.append(int(i))
+            used += sizes[i]
+
+    # keep source order inside the prompt → reads more naturally
+    picked.sort()
+    context = separator.join(texts[i] for i in picked)
+
+    total = sum(sizes)
+    stats = {
+        "candidates": len(texts),
+        "chunks_used": len(picked),
+        "tokens_used": used,
+        "tokens_all": total,
+        "tokens_saved": total - used,
+        "picked": picked,
+    }
+    if verbose:
+        print(f"[context] {len(picked)}/{len(texts)} chunks, "
+              f"{used}/{total} tokens (saved {total - used})")
+    return context, stats
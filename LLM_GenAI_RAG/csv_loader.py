@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import hashlib
+
+import pandas as pd
+
+
+# -----------------------------------
+# Columnar cache for CSV inputs
+#
+#   first run : CSV → dtype inference, numeric downcast,
+#               low-cardinality strings → category
+#               → uncompressed Feather file (one chunk per column)
+#               next to a small meta.json
+#   later runs: mtime + size unchanged (or same content hash)
+#               → Feather file is memory-mapped, no CSV parsing;
+#               numeric columns without nulls stay views of the mapped
+#               file (zero-copy, read-only), only categoricals / strings /
+#               nullable columns are materialized
+#
+# most of the RAM saving is the dtype downcasting; the zero-copy load
+# keeps the remaining numeric data in the page cache instead of the heap
+# -----------------------------------
+
+CACHE_DIR = ".csv_cache"
+
+
+def _file_hash(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def optimize_dtypes(df, category_ratio=0.5, max_categories=10_000):
+    """Smaller dtypes: downcast ints (and exactly representable floats), repeated strings → category."""
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            # float32 only if every value survives the round-trip
+            # (sums over prices / revenue must not drift)
+            small = s.astype("float32")
+            if small.astype(s.dtype).equals(s):
+                df[col] = small
+        elif s.dtype == object or pd.api.types.is_string_dtype(s):
+            n_unique = s.nunique(dropna=True)
+            if n_unique <= max_categories and n_unique <= category_ratio * max(len(s), 1):
+                df[col] = s.astype("category")
+    return df
+
+
+def _paths(path, cache_dir, read_options=None):
+    # same file read with another encoding / sep / dtype → different cache entry
+    options = json.dumps(read_options or {}, sort_keys=True, default=repr)
+    key = hashlib.sha256(f"{os.path.abspath(path)}\n{options}".encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(cache_dir, f"{os.path.basename(path)}.{key}")
+    return base + ".feather", base + ".meta.json"
+
+
+def _cache_is_fresh(path, data_path, meta_path):
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return False
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    st = os.stat(path)
+    if meta["mtime"] == st.st_mtime and meta["size"] == st.st_size:
+        return True
+
+    # touched but maybe not changed → compare content hash
+    if meta["size"] == st.st_size and meta["sha256"] == _file_hash(path):
+        meta["mtime"] = st.st_mtime
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return True
+    return False
+
+
+def load_csv(path, encoding=None, columns=None, cache_dir=CACHE_DIR, verbose=True, copy=False,
+             **read_csv_kwargs):
+    """
+    pd.read_csv with a memory-mapped columnar cache.
+    The mapped numeric columns are read-only (df.loc[i, col] = ... raises);
+    copy=True returns an ordinary writable frame instead.
+    """
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        # no pyarrow → plain CSV every time
+        return pd.read_csv(path, encoding=encoding, usecols=columns, **read_csv_kwargs)
+
+    data_path, meta_path = _paths(path, cache_dir, dict(read_csv_kwargs, encoding=encoding))
+    start = time.perf_counter()
+
+    if not _cache_is_fresh(path, data_path, meta_path):
+        df = optimize_dtypes(pd.read_csv(path, encoding=encoding, **read_csv_kwargs))
+
+        os.makedirs(cache_dir, exist_ok=True)
+        # one record batch → contiguous column buffers, so they can be mapped
+        # without concatenating chunks
+        feather.write_feather(df, data_path + ".tmp", compression="uncompressed",
+                              chunksize=max(len(df), 1))
+        os.replace(data_path + ".tmp", data_path)
+
+        st = os.stat(path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"mtime": st.st_mtime, "size": st.st_size, "sha256": _file_hash(path)}, f)
+        source = "csv → feather"
+    else:
+        source = "feather cache"
+
+    # uncompressed Feather + memory_map → column buffers come straight from the page cache;
+    # split_blocks keeps pandas from consolidating (= copying) them into one 2-D block
+    table = feather.read_table(data_path, columns=columns, memory_map=True)
+    df = table.to_pandas() if copy else table.to_pandas(split_blocks=True, self_destruct=True)
+
+    if verbose:
+        print(f"[csv_loader] {os.path.basename(path)}: {len(df)} rows from {source} "
+              f"in {time.perf_counter() - start:.2f}s, "
+              f"{df.memory_usage(deep=True).sum() / 2**20:.1f} MiB")
+    return df
@@ -1,8 +1,29 @@
-import pandas as pd
+import google.generativeai as genai
+import os
 
-df = pd.read_csv("file.csv")
-summary = genai.GenerativeModel("gemini-2.0-flash").generate_content(
-    f"Summarize this dataset and give 5 insights: {df.head().to_string()}"
-).text
+from csv_loader import load_csv
+from map_reduce import MapReduceSummarizer, csv_units
 
-print(summary)
\ No newline at end of file
+genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+model = genai.GenerativeModel("gemini-2.0-flash")
+
+# "head"       → only the first rows (quick look)
+# "map_reduce" → every row: blocks of rows summarized in parallel, then merged
+MODE = "map_reduce"
+
+if MODE == "map_reduce":
+    summarizer = MapReduceSummarizer(
+        lambda prompt: model.generate_content(prompt).text,
+        chunk_tokens=3000, reduce_tokens=6000, max_concurrency=4, kind="dataset"
+    )
+    summary = summarizer.summarize(
+        csv_units("file.csv", rows=200),
+        task="Summarize this dataset and give 5 insights."
+    )
+else:
+    df = load_csv("file.csv")
+    summary = model.generate_content(
+        f"Summarize this dataset and give 5 insights: {df.head().to_string()}"
+    ).text
+
+print(summary)
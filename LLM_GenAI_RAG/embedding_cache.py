@@ -0,0 +1,174 @@
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# -----------------------------------
+# Embedding cache shared by every embed_text / get_embedding
+#
+#   key   → (model name, sha256 of normalized text)
+#   value → float32 vector
+#
+#   LRU (in memory)  →  SQLite (on disk)  →  embedding API
+# -----------------------------------
+
+DEFAULT_PATH = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.sqlite")
+
+
+def normalize_text(text):
+    # "  Delivery   was slow \n" and "Delivery was slow" → same key
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+
+def text_key(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+
+    def __init__(self, path=DEFAULT_PATH, lru_size=10_000):
+        self.lru = OrderedDict()
+        self.lru_size = lru_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # streamlit / thread pools call in from other threads
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT, key TEXT, vector BLOB,"
+            " PRIMARY KEY (model, key))"
+        )
+        self.db.commit()
+
+    # ---- LRU helpers ----
+    def _lru_get(self, k):
+        v = self.lru.get(k)
+        if v is not None:
+            self.lru.move_to_end(k)
+        return v
+
+    def _lru_put(self, k, v):
+        self.lru[k] = v
+        self.lru.move_to_end(k)
+        if len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    # ---- single lookups ----
+    def get(self, model, text):
+        return self.get_many(model, [text])[0]
+
+    def put(self, model, text, vector):
+        self.put_many(model, [text], [vector])
+
+    # ---- batch lookups ----
+    def get_many(self, model, texts):
+        """Cached vectors in input order, None where missing."""
+        keys = [text_key(t) for t in texts]
+        out = [None] * len(texts)
+        missing = {}
+
+        with self._lock:
+            for i, k in enumerate(keys):
+                v = self._lru_get((model, k))
+                if v is not None:
+                    out[i] = v
+                else:
+                    missing.setdefault(k, []).append(i)
+
+            if missing:
+                ks = list(missing)
+                # sqlite caps bound variables → query in slices
+                for s in range(0, len(ks), 500):
+                    part = ks[s:s + 500]
+                    rows = self.db.execute(
+                        "SELECT key, vector FROM embeddings WHERE model = ? AND key IN (%s)"
+                        % ",".join("?" * len(part)),
+                        [model] + part,
+                    ).fetchall()
+                    for k, blob in rows:
+                        v = np.frombuffer(blob, dtype="float32")
+                        self._lru_put((model, k), v)
+                        for i in missing[k]:
+                            out[i] = v
+
+            found = sum(v is not None for v in out)
+            self.hits += found
+            self.misses += len(texts) - found
+
+        return out
+
+    def put_many(self, model, texts, vectors):
+        rows = []
+        with self._lock:
+            for t, v in zip(texts, vectors):
+                k = text_key(t)
+                v = np.asarray(v, dtype="float32")
+                self._lru_put((model, k), v)
+                rows.append((model, k, v.tobytes()))
+
+            self.db.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self.db.commit()
+
+    # ---- wrappers ----
+    def embed_many(self, model, texts, embed_batch_fn):
+        """
+        Vectors for texts, calling embed_batch_fn(list_of_texts) only
+        for the ones not cached yet (each distinct text once).
+        """
+        out = self.get_many(model, texts)
+
+        todo = {}
+        for i, v in enumerate(out):
+            if v is None:
+                todo.setdefault(normalize_text(texts[i]), []).append(i)
+
+        if todo:
+            new_texts = list(todo)
+            vectors = embed_batch_fn(new_texts)
+            self.put_many(model, new_texts, vectors)
+            for t, v in zip(new_texts, vectors):
+                v = np.asarray(v, dtype="float32")
+                for i in todo[t]:
+                    out[i] = v
+
+        return out
+
+    def cached(self, model, embed_fn):
+        """Wrap a one-text embed function: embed_fn(text) → vector."""
+        def wrapper(text):
+            v = self.get(model, text)
+            if v is None:
+                v = np.asarray(embed_fn(text), dtype="float32")
+                self.put(model, text, v)
+            return v
+        return wrapper
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "lru_size": len(self.lru),
+        }
+
+
+_shared = None
+
+
+def get_cache():
+    """One cache per process, shared by every script that imports it."""
+    global _shared
+    if _shared is None:
+        _shared = EmbeddingCache()
+    return _shared
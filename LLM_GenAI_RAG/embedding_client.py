@@ -0,0 +1,166 @@
+import json
+import time
+import random
+import asyncio
+import inspect
+import urllib.request
+import urllib.error
+
+import numpy as np
+
+
+# -----------------------------------
+# Batched + concurrent embedding client
+#
+#   texts → batches (≤ batch_size items, ≤ max_batch_chars)
+#         → asyncio workers (≤ max_concurrency in flight)
+#         → 429 → everybody pauses, retry with backoff
+#         → vectors back in input order
+# -----------------------------------
+
+
+class RateLimitError(Exception):
+    """Raised by an embed_batch function when the API answers 429."""
+
+    def __init__(self, message="rate limited", retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def make_batches(texts, batch_size=100, max_batch_chars=60_000):
+    """Split into (start, texts) batches by item count and total length."""
+    batches = []
+    start, current, chars = 0, [], 0
+
+    for i, t in enumerate(texts):
+        if current and (len(current) >= batch_size or chars + len(t) > max_batch_chars):
+            batches.append((start, current))
+            start, current, chars = i, [], 0
+        current.append(t)
+        chars += len(t)
+
+    if current:
+        batches.append((start, current))
+    return batches
+
+
+class EmbeddingClient:
+
+    def __init__(self, embed_batch, batch_size=100, max_batch_chars=60_000,
+                 max_concurrency=8, max_retries=6, base_delay=0.5,
+                 cache=None, model=None):
+        # embed_batch(list_of_texts) → list of vectors, sync or async
+        self.embed_batch = embed_batch
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.cache = cache
+        self.model = model
+
+        self.requests = 0
+        self.rate_limited = 0
+        self._resume_at = 0.0
+
+    async def _call(self, batch):
+        if inspect.iscoroutinefunction(self.embed_batch):
+            return await self.embed_batch(batch)
+        return await asyncio.to_thread(self.embed_batch, batch)
+
+    async def _run_batch(self, sem, batch):
+        async with sem:
+            for attempt in range(self.max_retries + 1):
+                # another worker got a 429 → wait until the shared cooldown ends
+                wait = self._resume_at - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                try:
+                    self.requests += 1
+                    vectors = await self._call(batch)
+                    if len(vectors) != len(batch):
+                        raise ValueError(f"expected {len(batch)} vectors, got {len(vectors)}")
+                    return vectors
+
+                except RateLimitError as e:
+                    self.rate_limited += 1
+                    if attempt == self.max_retries:
+                        raise
+                    delay = e.retry_after or self.base_delay * 2 ** attempt
+                    delay *= 1 + random.random() * 0.25
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    async def aembed(self, texts):
+        texts = list(texts)
+        out = [None] * len(texts)
+
+        if self.cache is not None:
+            out = self.cache.get_many(self.model, texts)
+
+        todo = [i for i, v in enumerate(out) if v is None]
+        if todo:
+            sem = asyncio.Semaphore(self.max_concurrency)
+            batches = make_batches([texts[i] for i in todo], self.batch_size, self.max_batch_chars)
+
+            results = await asyncio.gather(*[self._run_batch(sem, b) for _, b in batches])
+
+            # batch start offsets → put every vector back at its input position
+            for (start, batch), vectors in zip(batches, results):
+                for j, v in enumerate(vectors):
+                    out[todo[start + j]] = np.asarray(v, dtype="float32")
+
+            if self.cache is not None:
+                self.cache.put_many(self.model, [texts[i] for i in todo], [out[i] for i in todo])
+
+        return out
+
+    def embed(self, texts):
+        """Blocking version for plain scripts."""
+        return asyncio.run(self.aembed(texts))
+
+
+# -----------------------------------
+# embed_batch adapters
+# -----------------------------------
+def genai_embed_batch(model="text-embedding-004"):
+    """google.generativeai (genai.embed_content) – accepts a list as content."""
+    import google.generativeai as genai
+
+    def embed_batch(batch):
+        try:
+            return genai.embed_content(model=model, content=batch)["embedding"]
+        except Exception as e:
+            if getattr(e, "code", None) == 429 or "429" in str(e):
+                raise RateLimitError(str(e))
+            raise
+    return embed_batch
+
+
+def client_embed_batch(client, model="models/text-embedding-004"):
+    """google.genai Client (client.models.embed_content)."""
+    def embed_batch(batch):
+        try:
+            response = client.models.embed_content(model=model, contents=batch)
+        except Exception as e:
+            if getattr(e, "code", None) == 429:
+                raise RateLimitError(str(e))
+            raise
+        return [e.values for e in response.embeddings]
+    return embed_batch
+
+
+def http_embed_batch(url, model="fake-embedding", timeout=30):
+    """Plain JSON endpoint: POST {"model", "texts"} → {"embeddings": [...]}."""
+    def embed_batch(batch):
+        body = json.dumps({"model": model, "texts": batch}).encode("utf-8")
+        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                return json.loads(r.read())["embeddings"]
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                retry_after = e.headers.get("Retry-After")
+                raise RateLimitError("429 from " + url, float(retry_after) if retry_after else None)
+            raise
+    return embed_batch
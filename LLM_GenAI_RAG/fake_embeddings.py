@@ -0,0 +1,113 @@
+import re
+import json
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+# -----------------------------------
+# Deterministic fake embedder + local fake embedding server
+# → lets the RAG code run / be measured without network or API key
+#
+# each word → fixed random vector (seeded by its hash),
+# text → normalized sum of its word vectors
+# so texts sharing words end up close to each other
+# -----------------------------------
+
+DIM = 64
+
+
+def _word_vector(word, dim):
+    seed = int.from_bytes(hashlib.md5(word.encode("utf-8")).digest()[:4], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype("float32")
+
+
+def fake_embed(texts, dim=DIM):
+    out = np.zeros((len(texts), dim), dtype="float32")
+    for i, t in enumerate(texts):
+        for w in re.findall(r"\w+", t.lower()):
+            out[i] += _word_vector(w, dim)
+        n = np.linalg.norm(out[i])
+        if n > 0:
+            out[i] /= n
+    return out
+
+
+# -----------------------------------
+# HTTP server: POST {"texts": [...]} → {"embeddings": [[...], ...]}
+# rate_limit → max requests per second, extra ones get 429
+# -----------------------------------
+def make_server(port=8765, dim=DIM, latency=0.05, rate_limit=None):
+    state = {"window": 0, "count": 0, "requests": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+            with lock:
+                state["requests"] += 1
+                now = int(time.time())
+                if now != state["window"]:
+                    state["window"], state["count"] = now, 0
+                state["count"] += 1
+                limited = rate_limit is not None and state["count"] > rate_limit
+                if limited:
+                    state["rejected"] += 1
+
+            if limited:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.end_headers()
+                return
+
+            time.sleep(latency)      # pretend network round trip
+            vectors = fake_embed(body["texts"], dim).tolist()
+
+            data = json.dumps({"embeddings": vectors}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.stats = state
+    return server
+
+
+def start_server(**kwargs):
+    """Start in a background thread, returns (server, url)."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/embed"
+
+
+if __name__ == "__main__":
+    from embedding_client import EmbeddingClient, http_embed_batch
+
+    server, url = start_server(port=0, rate_limit=20)
+
+    texts = [f"feedback number {i} about delivery and support" for i in range(5_000)]
+
+    client = EmbeddingClient(http_embed_batch(url), batch_size=100, max_concurrency=8)
+    start = time.time()
+    vectors = client.embed(texts)
+    elapsed = time.time() - start
+
+    # order check: every vector must match a direct embed of the same text
+    expected = fake_embed(texts[:50])
+    assert np.allclose(np.array(vectors[:50]), expected, atol=1e-5)
+
+    print(f"{len(texts)} texts in {elapsed:.2f}s "
+          f"({len(texts) / elapsed:.0f} texts/s, {client.requests} requests, "
+          f"{client.rate_limited} rate limited)")
+    server.shutdown()
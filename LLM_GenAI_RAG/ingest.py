@@ -0,0 +1,204 @@
+import os
+import re
+import json
+import argparse
+
+import pandas as pd
+
+from pdf_extract import file_hash
+
+
+# -----------------------------------
+# Streaming ingestion: PDF / CSV → chunks → embeddings → vector store
+#
+#   pages / rows are read lazily (one at a time)
+#   → overlapping token-bounded chunks
+#   → embedded in batches, added to the PersistentIndex
+#   → saved every save_every batches (index file + only the new doc records)
+#   → checkpoint per file (path + content hash) → an interrupted run resumes
+#     where it stopped, an edited file starts over
+# -----------------------------------
+
+# words + punctuation ≈ model tokens (close enough for budgeting)
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text):
+    return len(TOKEN_RE.findall(text))
+
+
+def split_tokens(text):
+    # keep the original spacing so chunks read like the source text
+    return re.findall(r"\S+\s*", text)
+
+
+# -----------------------------------
+# Sources (lazy generators of (position, text))
+# -----------------------------------
+def iter_pdf_pages(path, start=0):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(path)          # pages are parsed on access
+    for i in range(start, len(reader.pages)):
+        yield i, reader.pages[i].extract_text() or ""
+
+
+def iter_csv_rows(path, text_column, start=0, chunksize=10_000, encoding=None):
+    reader = pd.read_csv(path, usecols=[text_column], chunksize=chunksize,
+                         encoding=encoding, skiprows=range(1, start + 1))
+    pos = start
+    for block in reader:
+        for text in block[text_column].astype(str):
+            yield pos, text
+            pos += 1
+
+
+# -----------------------------------
+# Chunking
+# -----------------------------------
+def chunk_text(text, max_tokens=400, overlap=50):
+    """Overlapping chunks of at most max_tokens (approx.) each."""
+    pieces = split_tokens(text)
+    if not pieces:
+        return []
+
+    sizes = [count_tokens(p) for p in pieces]
+    chunks, start = [], 0
+
+    while start < len(pieces):
+        end, total = start, 0
+        while end < len(pieces) and (total + sizes[end] <= max_tokens or end == start):
+            total += sizes[end]
+            end += 1
+        chunks.append("".join(pieces[start:end]).strip())
+        if end == len(pieces):
+            break
+
+        # step back so the next chunk repeats ~overlap tokens
+        back, kept = end, 0
+        while back > start + 1 and kept + sizes[back - 1] <= overlap:
+            back -= 1
+            kept += sizes[back]
+        start = back
+
+    return [c for c in chunks if c]
+
+
+def iter_chunks(units, source, max_tokens=400, overlap=50):
+    """(position, chunk id, chunk text) for every chunk of every unit."""
+    for pos, text in units:
+        for n, chunk in enumerate(chunk_text(text, max_tokens, overlap)):
+            yield pos, f"{source}:{pos}:{n}", chunk
+
+
+# -----------------------------------
+# Pipeline
+# -----------------------------------
+def _checkpoint_path(store):
+    return os.path.join(store.path, "ingest_checkpoint.json")
+
+
+def load_checkpoint(store, source):
+    path = _checkpoint_path(store)
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get(source, -1) + 1
+
+
+def save_checkpoint(store, source, position):
+    path = _checkpoint_path(store)
+    state = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    state[source] = position
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def ingest(units, source, store, embed_fn, batch_size=64, max_tokens=400, overlap=50,
+           save_every=16, checkpoint_key=None):
+    """
+    Chunk, embed and store units batch by batch.
+    The store is saved every save_every batches (rewriting index.faiss
+    after every batch would be O(N²) I/O) and the checkpoint only moves
+    with a save. Only whole units are checkpointed, so a crash redoes
+    the units since the last save (stored chunks are skipped by their
+    id + content hash).
+    """
+    checkpoint_key = checkpoint_key or source
+    batch, last_pos, total, unsaved = [], None, 0, 0
+
+    def flush(done_pos, final=False):
+        nonlocal batch, total, unsaved
+        if batch:
+            ids, texts = zip(*batch)
+            total += store.add_documents(list(texts), embed_fn, ids=list(ids))
+            batch = []
+            unsaved += 1
+        if unsaved and (final or unsaved >= save_every):
+            store.save()
+            unsaved = 0
+        if done_pos is not None and not unsaved:
+            save_checkpoint(store, checkpoint_key, done_pos)
+
+    for pos, chunk_id, chunk in iter_chunks(units, source, max_tokens, overlap):
+        if last_pos is not None and pos != last_pos and len(batch) >= batch_size:
+            flush(last_pos)          # every unit before pos is complete
+        batch.append((chunk_id, chunk))
+        last_pos = pos
+
+    flush(last_pos, final=True)
+    return total
+
+
+def _source_keys(path):
+    # chunk ids: full path → same-named files in different folders don't collide
+    # checkpoint: path + content hash → an edited file is ingested again
+    source = os.path.abspath(path)
+    return source, f"{source}#{file_hash(path)}"
+
+
+def ingest_pdf(path, store, embed_fn, **kwargs):
+    source, key = _source_keys(path)
+    start = load_checkpoint(store, key)
+    return ingest(iter_pdf_pages(path, start), source, store, embed_fn,
+                  checkpoint_key=key, **kwargs)
+
+
+def ingest_csv(path, text_column, store, embed_fn, encoding=None, **kwargs):
+    source, key = _source_keys(path)
+    start = load_checkpoint(store, key)
+    return ingest(iter_csv_rows(path, text_column, start, encoding=encoding),
+                  source, store, embed_fn, checkpoint_key=key, **kwargs)
+
+
+if __name__ == "__main__":
+    from embedding_cache import get_cache
+    from embedding_client import EmbeddingClient, genai_embed_batch
+    from vector_store import PersistentIndex
+
+    parser = argparse.ArgumentParser(description="Ingest a PDF or CSV into a vector store")
+    parser.add_argument("path")
+    parser.add_argument("--store", default="rag_store")
+    parser.add_argument("--text-column", default="feedback")
+    parser.add_argument("--max-tokens", type=int, default=400)
+    parser.add_argument("--overlap", type=int, default=50)
+    args = parser.parse_args()
+
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+    client = EmbeddingClient(genai_embed_batch("text-embedding-004"),
+                             cache=get_cache(), model="text-embedding-004")
+    store = PersistentIndex(args.store)
+
+    opts = {"max_tokens": args.max_tokens, "overlap": args.overlap}
+    if args.path.lower().endswith(".pdf"):
+        added = ingest_pdf(args.path, store, client.embed, **opts)
+    else:
+        added = ingest_csv(args.path, args.text_column, store, client.embed, **opts)
+
+    print(f"Embedded {added} new chunks → {store.ntotal} vectors in {args.store}")
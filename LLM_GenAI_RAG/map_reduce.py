@@ -0,0 +1,120 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ingest import count_tokens, chunk_text
+
+
+# -----------------------------------
+# Map-reduce summarization for inputs of any size
+#
+#   units (pages / CSV row blocks, streamed)
+#     → packed into chunks of ≤ chunk_tokens
+#     → MAP:    summarize every chunk, ≤ max_concurrency at once
+#     → REDUCE: group summaries into ≤ reduce_tokens, summarize again,
+#               repeat until one summary is left
+#
+# only summaries are kept in memory, so the input is limited by disk;
+# wall time ≈ (chunks / max_concurrency) · one LLM call + log(chunks) levels
+# -----------------------------------
+
+MAP_PROMPT = """You are summarizing part {part} of a larger {kind}.
+Write a compact summary of the key facts, numbers and trends in this part.
+
+{text}
+"""
+
+REDUCE_PROMPT = """Below are summaries of consecutive parts of a {kind}.
+Merge them into one summary, keeping the most important facts and numbers.
+
+{text}
+"""
+
+FINAL_PROMPT = """Below are summaries covering an entire {kind}.
+{task}
+
+{text}
+"""
+
+
+def pack_units(units, chunk_tokens):
+    """Stream of texts → stream of chunks of ≤ chunk_tokens (big units are split)."""
+    buf, size = [], 0
+    for text in units:
+        n = count_tokens(text)
+        if n > chunk_tokens:
+            if buf:
+                yield "\n".join(buf)
+                buf, size = [], 0
+            yield from chunk_text(text, chunk_tokens, overlap=0)
+            continue
+        if buf and size + n > chunk_tokens:
+            yield "\n".join(buf)
+            buf, size = [], 0
+        buf.append(text)
+        size += n
+    if buf:
+        yield "\n".join(buf)
+
+
+def csv_units(path, rows=500, encoding=None):
+    """CSV → header + rows as text, one block of rows at a time."""
+    for block in pd.read_csv(path, chunksize=rows, encoding=encoding):
+        yield block.to_csv(index=False)
+
+
+class MapReduceSummarizer:
+
+    def __init__(self, generate_fn, chunk_tokens=3000, reduce_tokens=6000,
+                 max_concurrency=4, kind="document"):
+        # generate_fn(prompt) → text
+        self.generate_fn = generate_fn
+        self.chunk_tokens = chunk_tokens
+        self.reduce_tokens = reduce_tokens
+        self.max_concurrency = max_concurrency
+        self.kind = kind
+        self.calls = 0
+
+    def _generate(self, prompt):
+        self.calls += 1
+        return self.generate_fn(prompt)
+
+    def _map(self, units):
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        # bounded: the input is never read further ahead than the workers can take
+        slots = threading.BoundedSemaphore(self.max_concurrency * 2)
+        futures = []
+
+        def run(prompt):
+            try:
+                return self._generate(prompt)
+            finally:
+                slots.release()
+
+        with pool:
+            for n, chunk in enumerate(pack_units(units, self.chunk_tokens), start=1):
+                slots.acquire()
+                prompt = MAP_PROMPT.format(part=n, kind=self.kind, text=chunk)
+                futures.append(pool.submit(run, prompt))
+            return [f.result() for f in futures]          # keeps document order
+
+    def _reduce_level(self, summaries):
+        groups = list(pack_units(summaries, self.reduce_tokens))
+        prompts = [REDUCE_PROMPT.format(kind=self.kind, text=g) for g in groups]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(self._generate, prompts))
+
+    def summarize(self, units, task="Summarize it."):
+        summaries = self._map(units)
+        if not summaries:
+            return ""
+
+        # hierarchical reduce until everything fits in one final prompt
+        while sum(count_tokens(s) for s in summaries) > self.reduce_tokens and len(summaries) > 1:
+            reduced = self._reduce_level(summaries)
+            if len(reduced) >= len(summaries):
+                break                     # summaries no longer shrink → stop here
+            summaries = reduced
+
+        return self._generate(FINAL_PROMPT.format(kind=self.kind, task=task, text="\n\n".join(summaries)))
@@ -0,0 +1,172 @@
+import re
+import json
+
+import pandas as pd
+
+
+# -----------------------------------
+# Question answering over a DataFrame with a restricted aggregation plan
+#
+#   1. model sees only the schema (column names, dtypes, sample values)
+#      and answers with a JSON plan: filters → groupby → aggregations → sort → limit
+#   2. plan is validated (known columns, whitelisted ops, row limit)
+#      and run locally with pandas on the FULL DataFrame — no eval / exec
+#   3. model sees only the small result table and writes the answer
+#
+# prompt size depends on the number of columns, not the number of rows
+# -----------------------------------
+
+FILTER_OPS = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    "in": lambda s, v: s.isin(v if isinstance(v, list) else [v]),
+    "contains": lambda s, v: s.astype(str).str.contains(str(v), case=False, regex=False),
+}
+
+AGG_FUNCS = {"sum", "mean", "median", "min", "max", "count", "nunique"}
+MAX_ROWS = 50
+
+PLAN_PROMPT = """You answer questions about a table by writing a JSON query plan.
+Table columns (name: dtype, example values):
+{schema}
+
+Plan format (JSON only, no explanation):
+{{
+  "filters": [{{"column": "...", "op": "== | != | > | >= | < | <= | in | contains", "value": ...}}],
+  "groupby": ["column", ...],
+  "aggregations": [{{"column": "...", "func": "sum | mean | median | min | max | count | nunique", "as": "name"}}],
+  "columns": ["column", ...],
+  "sort": {{"by": "column or aggregation name", "ascending": false}},
+  "limit": 10
+}}
+All keys are optional. Use "columns" only when there are no aggregations.
+
+Question: {question}
+"""
+
+ANSWER_PROMPT = """Question: {question}
+
+The query plan below was run on the full dataset ({n_rows} rows):
+{plan}
+
+Result:
+{result}
+
+Answer the question using only this result.
+"""
+
+
+class PlanError(ValueError):
+    pass
+
+
+def describe_schema(df, examples=3):
+    lines = []
+    for col in df.columns:
+        values = df[col].dropna().unique()[:examples]
+        lines.append(f"- {col}: {df[col].dtype}, e.g. {', '.join(map(str, values))}")
+    return "\n".join(lines)
+
+
+def parse_plan(text):
+    # models like wrapping JSON in ```json fences
+    match = re.search(r"\{.*\}", text, re.S)
+    if not match:
+        raise PlanError("no JSON object in model output")
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError as e:
+        raise PlanError(f"invalid JSON: {e}")
+
+
+def _check_column(df, col, allowed_extra=()):
+    if col not in df.columns and col not in allowed_extra:
+        raise PlanError(f"unknown column: {col!r}")
+    return col
+
+
+def run_plan(df, plan, max_rows=MAX_ROWS):
+    """Validate and execute a plan → small result DataFrame."""
+    if not isinstance(plan, dict):
+        raise PlanError("plan must be a JSON object")
+    unknown = set(plan) - {"filters", "groupby", "aggregations", "columns", "sort", "limit"}
+    if unknown:
+        raise PlanError(f"unknown plan keys: {sorted(unknown)}")
+
+    out = df
+    for f in plan.get("filters") or []:
+        col = _check_column(df, f.get("column"))
+        op = f.get("op")
+        if op not in FILTER_OPS:
+            raise PlanError(f"unsupported filter op: {op!r}")
+        out = out[FILTER_OPS[op](out[col], f.get("value"))]
+
+    groupby = [_check_column(df, c) for c in plan.get("groupby") or []]
+    aggs = plan.get("aggregations") or []
+    names = []
+
+    if aggs:
+        spec = {}
+        for a in aggs:
+            col = _check_column(df, a.get("column"))
+            func = a.get("func")
+            if func not in AGG_FUNCS:
+                raise PlanError(f"unsupported aggregation: {func!r}")
+            name = a.get("as") or f"{func}_{col}"
+            spec[name] = (col, func)
+            names.append(name)
+
+        if groupby:
+            out = out.groupby(groupby, observed=True).agg(**spec).reset_index()
+        else:
+            out = pd.DataFrame({n: [out[c].agg(f)] for n, (c, f) in spec.items()})
+    elif groupby:
+        out = out.groupby(groupby, observed=True).size().reset_index(name="count")
+        names.append("count")
+    elif plan.get("columns"):
+        out = out[[_check_column(df, c) for c in plan["columns"]]]
+
+    sort = plan.get("sort")
+    if sort:
+        by = _check_column(out, sort.get("by"), allowed_extra=names)
+        out = out.sort_values(by, ascending=bool(sort.get("ascending", False)))
+
+    limit = plan.get("limit")
+    if limit is None:
+        limit = max_rows
+    elif isinstance(limit, bool) or not isinstance(limit, int):
+        raise PlanError(f"limit must be an integer, got {limit!r}")
+    # 1..max_rows whatever the model asks for → result size stays bounded
+    return out.head(max(1, min(limit, max_rows)))
+
+
+def answer_question(df, question, generate_fn, retries=1, verbose=True):
+    """
+    generate_fn(prompt) → text. Returns (answer, plan, result table).
+    An invalid plan is sent back to the model with the error, `retries` times.
+    """
+    prompt = PLAN_PROMPT.format(schema=describe_schema(df), question=question)
+
+    for attempt in range(retries + 1):
+        raw = generate_fn(prompt)
+        try:
+            plan = parse_plan(raw)
+            result = run_plan(df, plan)
+            break
+        except (PlanError, KeyError, TypeError, ValueError) as e:
+            if attempt == retries:
+                raise
+            prompt += f"\nYour previous plan failed: {e}\nPrevious plan: {raw}\nReturn a corrected plan.\n"
+
+    if verbose:
+        print("Plan:", json.dumps(plan))
+        print(result.to_string(index=False))
+
+    answer = generate_fn(ANSWER_PROMPT.format(
+        question=question, n_rows=len(df), plan=json.dumps(plan), result=result.to_string(index=False)
+    ))
+    return answer, plan, result
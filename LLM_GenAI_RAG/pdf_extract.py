@@ -0,0 +1,96 @@
+import os
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+
+# -----------------------------------
+# Parallel PDF text extraction with a per-page disk cache
+#
+#   cache/<file sha256>/<page>.txt
+#   cache/<file sha256>/pages        → page count
+#
+#   unchanged PDF  → every page read from cache, PyPDF2 never runs
+#   new / edited   → missing pages split into ranges → process pool
+#                    (page.extract_text() is CPU-bound, threads don't help)
+# -----------------------------------
+
+CACHE_DIR = "pdf_text_cache"
+PAGES_FILE = "pages"
+
+
+def file_hash(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _extract_pages(path, pages):
+    # runs in a worker process → opens its own reader
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(path)
+    return [(p, reader.pages[p].extract_text() or "") for p in pages]
+
+
+def _page_count(path, folder):
+    # cached next to the pages → a fully cached PDF is never opened by PyPDF2
+    count_file = os.path.join(folder, PAGES_FILE)
+    if os.path.exists(count_file):
+        with open(count_file, "r", encoding="utf-8") as f:
+            return int(f.read())
+
+    import PyPDF2
+    n_pages = len(PyPDF2.PdfReader(path).pages)
+    with open(count_file + ".tmp", "w", encoding="utf-8") as f:
+        f.write(str(n_pages))
+    os.replace(count_file + ".tmp", count_file)
+    return n_pages
+
+
+def extract_pages(path, workers=None, cache_dir=CACHE_DIR, pages_per_task=8):
+    """Text of every page, in page order."""
+    folder = os.path.join(cache_dir, file_hash(path))
+    os.makedirs(folder, exist_ok=True)
+
+    n_pages = _page_count(path, folder)
+    texts = [None] * n_pages
+
+    for p in range(n_pages):
+        page_file = os.path.join(folder, f"{p}.txt")
+        if os.path.exists(page_file):
+            with open(page_file, "r", encoding="utf-8") as f:
+                texts[p] = f.read()
+
+    missing = [p for p in range(n_pages) if texts[p] is None]
+    if missing:
+        tasks = [missing[i:i + pages_per_task] for i in range(0, len(missing), pages_per_task)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_extract_pages, [path] * len(tasks), tasks):
+                for p, text in result:
+                    texts[p] = text
+                    tmp = os.path.join(folder, f"{p}.txt.tmp")
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.write(text)
+                    os.replace(tmp, os.path.join(folder, f"{p}.txt"))
+
+    return texts
+
+
+def extract_text(path, **kwargs):
+    return "".join(extract_pages(path, **kwargs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract PDF text (parallel + cached)")
+    parser.add_argument("path")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pages = extract_pages(args.path, workers=args.workers)
+    print(f"{len(pages)} pages, {sum(map(len, pages))} chars in {time.perf_counter() - start:.2f}s")
@@ -1,15 +1,49 @@
-import PyPDF2
 import google.generativeai as genai
 import os
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("models/gemini-pro-latest")
+from context_builder import build_context
+from embedding_cache import get_cache
+from embedding_client import EmbeddingClient, genai_embed_batch
+from ingest import chunk_text
+from map_reduce import MapReduceSummarizer
+from pdf_extract import extract_pages
 
-reader = PyPDF2.PdfReader("/Users/tayyabkhan/python/report.pdf")
-text = "".join(page.extract_text() for page in reader.pages)
+# main guard → page extraction runs in a process pool (spawn re-imports this file)
+if __name__ == "__main__":
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    model = genai.GenerativeModel("models/gemini-pro-latest")
 
-response = model.generate_content(
-    f"Summarize this report and give 10 insights:\n{text}"
-)
+    PDF_PATH = "/Users/tayyabkhan/python/report.pdf"
+    TASK = "Summarize this report and give 10 insights"
 
-print(response.text)
+    # "budget"     → one prompt with the most useful chunks (fast, cheap)
+    # "map_reduce" → every part of the report is read (any length)
+    MODE = "budget"
+
+    # pages extracted in parallel, cached per (file hash, page) → re-runs skip PyPDF2
+    pages = extract_pages(PDF_PATH)
+
+    if MODE == "map_reduce":
+        summarizer = MapReduceSummarizer(
+            lambda prompt: model.generate_content(prompt).text,
+            chunk_tokens=3000, reduce_tokens=6000, max_concurrency=4, kind="report"
+        )
+        print(summarizer.summarize(pages, task=TASK))
+
+    else:
+        # whole report → chunks → keep the most useful, non-repetitive ones within budget
+        TOKEN_BUDGET = 6000
+
+        chunks = chunk_text("".join(pages), max_tokens=300, overlap=30)
+
+        embedder = EmbeddingClient(genai_embed_batch("text-embedding-004"),
+                                   cache=get_cache(), model="text-embedding-004")
+        vectors = embedder.embed(chunks + [TASK + ": key findings, results, risks, recommendations"])
+
+        context, _ = build_context(vectors[-1], chunks, vectors[:-1], token_budget=TOKEN_BUDGET)
+
+        response = model.generate_content(
+            f"{TASK}:\n{context}"
+        )
+
+        print(response.text)
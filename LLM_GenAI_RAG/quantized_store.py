@@ -0,0 +1,148 @@
+import time
+import argparse
+
+import numpy as np
+
+from similarity_search import normalize_rows, top_k
+
+
+# -----------------------------------
+# Compact embedding store with quantization
+#
+#   float32 → 4 bytes / dim  (exact)
+#   float16 → 2 bytes / dim
+#   int8    → 1 byte  / dim  (per-dimension scale)
+#   binary  → 1 bit   / dim  (sign bits, Hamming distance)
+#
+# search = coarse pass over the quantized codes
+#        → exact float32 re-scoring of the top candidates
+# the float32 copy can live on disk (memmap) so only codes use RAM
+# -----------------------------------
+
+MODES = ("float32", "float16", "int8", "binary")
+BLOCK = 65_536          # rows per block → bounded temporary memory
+
+
+def _popcount(x):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return _POPCOUNT_TABLE[x]
+
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype="uint8")
+
+
+class QuantizedStore:
+
+    def __init__(self, embeddings, mode="int8", float32_path=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.mode = mode
+
+        if not isinstance(embeddings, np.ndarray) or embeddings.dtype == object:
+            embeddings = np.stack([np.asarray(e, dtype="float32") for e in embeddings])
+        X = normalize_rows(embeddings)
+        self.n, self.dim = X.shape
+
+        # exact vectors for re-scoring: on disk if a path is given
+        if float32_path:
+            np.save(float32_path, X)
+            self.exact = np.load(float32_path, mmap_mode="r")
+        else:
+            self.exact = X
+
+        if mode == "float32":
+            self.codes = X
+        elif mode == "float16":
+            self.codes = X.astype("float16")
+        elif mode == "int8":
+            self.scale = np.abs(X).max(axis=0) / 127.0
+            self.scale[self.scale == 0] = 1.0
+            self.codes = np.round(X / self.scale).astype("int8")
+        else:
+            self.codes = np.packbits(X > 0, axis=1)
+
+    # ---- coarse scores (higher = better) ----
+    def coarse_scores(self, query):
+        q = normalize_rows(query)[0]
+        out = np.empty(self.n, dtype="float32")
+
+        if self.mode == "binary":
+            qbits = np.packbits(q > 0)
+            for s in range(0, self.n, BLOCK):
+                ham = _popcount(self.codes[s:s + BLOCK] ^ qbits).sum(axis=1, dtype="int32")
+                out[s:s + BLOCK] = -ham
+            return out
+
+        if self.mode == "int8":
+            q = q * self.scale          # fold the scale into the query once
+        for s in range(0, self.n, BLOCK):
+            out[s:s + BLOCK] = self.codes[s:s + BLOCK].astype("float32") @ q
+        return out
+
+    def search(self, query, k=10, rescore=True, candidates=None):
+        """(indices, cosine similarities) of the k best rows."""
+        coarse = self.coarse_scores(query)
+        if not rescore or self.mode == "float32":
+            idx = top_k(coarse, k)
+            return idx, coarse[idx]
+
+        cand = top_k(coarse, candidates or max(10 * k, 100))
+        cand.sort()                                  # sequential reads from the memmap
+        exact = np.asarray(self.exact[cand]) @ normalize_rows(query)[0]
+        best = top_k(exact, k)
+        return cand[best], exact[best]
+
+    def memory_bytes(self):
+        codes = self.codes.nbytes
+        exact = 0 if isinstance(self.exact, np.memmap) else self.exact.nbytes
+        if self.mode == "float32":
+            exact = 0                                # codes are the exact vectors
+        return {"codes": codes, "exact_in_ram": exact}
+
+
+def recall_at_k(store, queries, truth, k, **search_kwargs):
+    hits = 0
+    for q, t in zip(queries, truth):
+        idx, _ = store.search(q, k, **search_kwargs)
+        hits += len(set(idx.tolist()) & set(t.tolist()))
+    return hits / (len(queries) * k)
+
+
+# -----------------------------------
+# Memory + recall report per mode
+#   python quantized_store.py --n 200000 --dim 768
+# -----------------------------------
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((200, args.dim)).astype("float32")
+    X = centers[rng.integers(0, 200, args.n)] + 0.5 * rng.standard_normal((args.n, args.dim), dtype="float32")
+    Q = X[rng.choice(args.n, args.queries, replace=False)] + 0.1 * rng.standard_normal((args.queries, args.dim), dtype="float32")
+
+    exact = QuantizedStore(X, "float32")
+    truth = [exact.search(q, args.k)[0] for q in Q]
+
+    print(f"n={args.n} dim={args.dim}  (pandas list column ≈ {args.n * (args.dim * 32 + 56) / 2**20:.0f} MiB)\n")
+    print(f"{'mode':<9}{'codes MiB':>11}{'coarse recall':>15}{'rescored recall':>17}{'ms/query':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            store = QuantizedStore(X, mode, float32_path=os.path.join(tmp, f"{mode}.npy"))
+            coarse = recall_at_k(store, Q, truth, args.k, rescore=False)
+
+            start = time.perf_counter()
+            rescored = recall_at_k(store, Q, truth, args.k)
+            ms = (time.perf_counter() - start) * 1000 / args.queries
+
+            mib = store.memory_bytes()["codes"] / 2**20
+            print(f"{mode:<9}{mib:>11.1f}{coarse:>15.3f}{rescored:>17.3f}{ms:>10.2f}")
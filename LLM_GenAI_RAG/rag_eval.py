@@ -0,0 +1,127 @@
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from bm25 import BM25Index, HybridRetriever
+from retriever import Retriever
+
+
+# -----------------------------------
+# Offline RAG retrieval evaluation
+#
+#   corpus.jsonl    → {"id": ..., "text": ...}            one per line
+#   questions.jsonl → {"question": ..., "relevant_doc_ids": [...]}
+#
+#   python rag_eval.py eval_data/corpus.jsonl eval_data/questions.jsonl --k 2
+#
+# reports recall@k, MRR, p50/p95/p99 retrieval latency, embeddings/sec
+# default embedder is the local deterministic fake → no network needed
+# -----------------------------------
+
+
+def read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def get_embedder(name):
+    if name == "fake":
+        from fake_embeddings import fake_embed
+        return fake_embed
+
+    import os
+    import google.generativeai as genai
+    from embedding_cache import get_cache
+    from embedding_client import EmbeddingClient, genai_embed_batch
+
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    client = EmbeddingClient(genai_embed_batch("text-embedding-004"),
+                             cache=get_cache(), model="text-embedding-004")
+    return client.embed
+
+
+def recall_at_k(found, relevant, k):
+    if not relevant:
+        return 0.0
+    return len(set(found[:k]) & set(relevant)) / len(relevant)
+
+
+def reciprocal_rank(found, relevant):
+    for rank, doc_id in enumerate(found, start=1):
+        if doc_id in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def evaluate(corpus, questions, embed_fn, k=5, mode="dense", index_config=None, workers=8):
+    doc_ids = [d["id"] for d in corpus]
+    texts = [d["text"] for d in corpus]
+
+    # ---- embed corpus + questions (timed) ----
+    start = time.perf_counter()
+    doc_vectors = np.asarray(embed_fn(texts), dtype="float32")
+    q_vectors = np.asarray(embed_fn([q["question"] for q in questions]), dtype="float32")
+    embed_time = time.perf_counter() - start
+
+    retriever = Retriever(index_config or {"type": "flat"}).build(doc_vectors)
+    q_position = {q["question"]: i for i, q in enumerate(questions)}
+
+    def dense_search(text, n):
+        _, I = retriever.search(q_vectors[q_position[text]], n)
+        return [i for i in I[0] if i != -1]
+
+    hybrid = HybridRetriever(texts, dense_search, bm25=BM25Index(texts)) if mode != "dense" else None
+
+    def run(q):
+        t0 = time.perf_counter()
+        if mode == "dense":
+            positions = dense_search(q["question"], k)
+        else:
+            positions = hybrid.search(q["question"], k, dense=(mode == "hybrid"))
+        latency = time.perf_counter() - t0
+        return [doc_ids[p] for p in positions], latency
+
+    # ---- retrieval in parallel (FAISS releases the GIL) ----
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, questions))
+
+    recalls, rranks, latencies = [], [], []
+    for q, (found, latency) in zip(questions, results):
+        relevant = set(q["relevant_doc_ids"])
+        recalls.append(recall_at_k(found, relevant, k))
+        rranks.append(reciprocal_rank(found, relevant))
+        latencies.append(latency * 1000)
+
+    return {
+        "questions": len(questions),
+        "k": k,
+        "mode": mode,
+        f"recall@{k}": float(np.mean(recalls)),
+        "mrr": float(np.mean(rranks)),
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+        "embeddings_per_sec": (len(texts) + len(questions)) / embed_time if embed_time else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus")
+    parser.add_argument("questions")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--mode", choices=["dense", "bm25", "hybrid"], default="dense")
+    parser.add_argument("--index", default="flat", help="flat / ivf_flat / hnsw / ivf_pq")
+    parser.add_argument("--embedder", choices=["fake", "gemini"], default="fake")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    report = evaluate(
+        read_jsonl(args.corpus), read_jsonl(args.questions), get_embedder(args.embedder),
+        k=args.k, mode=args.mode, index_config={"type": args.index}, workers=args.workers,
+    )
+    for name, value in report.items():
+        print(f"{name:<20}{value:.4f}" if isinstance(value, float) else f"{name:<20}{value}")
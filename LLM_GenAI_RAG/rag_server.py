@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import asyncio
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ingest import count_tokens
+
+
+# -----------------------------------
+# Async streaming RAG server (stdlib asyncio, Server-Sent Events)
+#
+#   GET /ask?q=...   → text/event-stream, one "data:" event per LLM chunk
+#   GET /metrics     → JSON: time-to-first-token, tokens/sec, requests
+#
+# per request:
+#   embed query  → thread pool (short jobs only)
+#   FAISS search → thread pool
+#   LLM stream   → its own thread → asyncio.Queue → client
+#                  (long streams never occupy the pool; a client that
+#                  disconnects sets a cancel flag → the producer stops)
+# many clients are served at once, none blocks the event loop
+#
+#   python rag_server.py --mock        (fake embedder + mock LLM, no API key)
+# -----------------------------------
+
+PROMPT_TEMPLATE = """
+You are an AI assistant.
+Answer ONLY using the context below.
+If answer is not present, say "I don't know".
+
+Context:
+{context}
+
+Question:
+{question}
+"""
+
+
+class MockLLM:
+    """Same shape as client.models.generate_content_stream, no network."""
+
+    def __init__(self, delay=0.02, first_token_delay=0.2):
+        self.delay = delay
+        self.first_token_delay = first_token_delay
+
+    def stream(self, prompt):
+        time.sleep(self.first_token_delay)
+        question = prompt.rsplit("Question:", 1)[-1].strip()
+        for word in f"Mock answer to: {question}".split():
+            yield word + " "
+            time.sleep(self.delay)
+
+
+def gemini_stream(client, model="models/gemini-flash-latest"):
+    def stream(prompt):
+        for chunk in client.models.generate_content_stream(model=model, contents=prompt):
+            if chunk.text:
+                yield chunk.text
+    return stream
+
+
+class Metrics:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.active = 0
+        self.cancelled = 0
+        self.ttft = []           # seconds, per request
+        self.tokens_per_sec = []
+
+    def record(self, ttft, tokens, duration):
+        with self.lock:
+            self.ttft.append(ttft)
+            if duration > 0:
+                self.tokens_per_sec.append(tokens / duration)
+
+    def summary(self):
+        def pct(values, p):
+            return round(float(np.percentile(values, p)), 4) if values else None
+
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "active": self.active,
+                "cancelled": self.cancelled,
+                "ttft_p50_s": pct(self.ttft, 50),
+                "ttft_p95_s": pct(self.ttft, 95),
+                "tokens_per_sec_p50": pct(self.tokens_per_sec, 50),
+            }
+
+
+class RAGService:
+
+    def __init__(self, docs, embed_fn, search_fn, llm_stream, k=2, max_workers=8):
+        # embed_fn([text]) → vectors, search_fn(vectors, k) → (D, I)
+        self.docs = docs
+        self.embed_fn = embed_fn
+        self.search_fn = search_fn
+        self.llm_stream = llm_stream
+        self.k = k
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.metrics = Metrics()
+
+    async def retrieve(self, question):
+        loop = asyncio.get_running_loop()
+        q = await loop.run_in_executor(self.pool, self.embed_fn, [question])
+        _, I = await loop.run_in_executor(self.pool, self.search_fn, np.asarray(q, dtype="float32"), self.k)
+        return [self.docs[i] for i in I[0] if i != -1]
+
+    async def answer_stream(self, question):
+        """Async generator of LLM text chunks for one question."""
+        start = time.perf_counter()
+        self.metrics.requests += 1
+        self.metrics.active += 1
+
+        try:
+            context = "\n".join(await self.retrieve(question))
+            prompt = PROMPT_TEMPLATE.format(context=context, question=question)
+
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue()
+            done = object()
+            cancel = threading.Event()
+
+            def put(item):
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+
+            def produce():
+                # blocking SDK iterator → one dedicated thread per stream,
+                # so streams can't queue behind each other in the pool
+                chunks = self.llm_stream(prompt)
+                try:
+                    for chunk in chunks:
+                        if cancel.is_set():
+                            break           # client is gone → stop generating
+                        put(chunk)
+                except Exception as e:
+                    put(e)
+                finally:
+                    if hasattr(chunks, "close"):
+                        chunks.close()
+                    put(done)
+
+            threading.Thread(target=produce, daemon=True).start()
+
+            first, tokens, finished = None, 0, False
+            try:
+                while True:
+                    chunk = await queue.get()
+                    if chunk is done:
+                        finished = True
+                        break
+                    if isinstance(chunk, Exception):
+                        finished = True     # producer already stopped
+                        raise chunk
+                    if first is None:
+                        first = time.perf_counter()
+                    tokens += count_tokens(chunk)
+                    yield chunk
+            finally:
+                if not finished:
+                    # consumer went away (disconnect / aclose) or failed
+                    cancel.set()
+                    self.metrics.cancelled += 1
+
+            end = time.perf_counter()
+            if first is not None:
+                self.metrics.record(first - start, tokens, end - first)
+        finally:
+            self.metrics.active -= 1
+
+
+# -----------------------------------
+# HTTP layer (asyncio streams, chunked SSE)
+# -----------------------------------
+def _sse(data):
+    return ("data: " + json.dumps(data) + "\n\n").encode("utf-8")
+
+
+async def _write_chunk(writer, payload):
+    writer.write(f"{len(payload):X}\r\n".encode() + payload + b"\r\n")
+    await writer.drain()
+
+
+def make_handler(service):
+
+    async def handle(reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass                       # skip headers
+
+            parts = request_line.decode("latin1").split()
+            url = urlparse(parts[1] if len(parts) > 1 else "/")
+
+            if url.path == "/metrics":
+                body = json.dumps(service.metrics.summary()).encode("utf-8")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                             + body)
+                await writer.drain()
+                return
+
+            question = parse_qs(url.query).get("q", [""])[0]
+            if url.path != "/ask" or not question:
+                writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n"
+                         b"Connection: close\r\n\r\n")
+
+            stream = service.answer_stream(question)
+            try:
+                async for chunk in stream:
+                    await _write_chunk(writer, _sse({"text": chunk}))
+            finally:
+                await stream.aclose()      # disconnect → producer is cancelled now, not at GC
+
+            await _write_chunk(writer, b"event: done\ndata: {}\n\n")
+            await _write_chunk(writer, b"")
+        except (ConnectionResetError, BrokenPipeError):
+            pass                           # client went away mid-stream
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(service, host="127.0.0.1", port=8000):
+    server = await asyncio.start_server(make_handler(service), host, port)
+    print(f"RAG server on http://{host}:{port}/ask?q=...")
+    async with server:
+        await server.serve_forever()
+
+
+def build_mock_service():
+    from fake_embeddings import fake_embed
+    from retriever import Retriever
+
+    docs = [
+        "RAG helps large language models use external knowledge.",
+        "FAISS is a library for efficient similarity search.",
+        "Gemini provides fast and scalable LLM APIs.",
+        "Vector databases store embeddings for semantic search.",
+    ]
+    retriever = Retriever(type="flat").build(fake_embed(docs))
+    return RAGService(docs, fake_embed, retriever.search, MockLLM().stream)
+
+
+def build_gemini_service(store_path):
+    from google import genai
+    from vector_store import PersistentIndex
+
+    client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    store = PersistentIndex(store_path)
+
+    # faiss ids → positions in a plain list, like the other examples
+    ids = sorted(i for i, d in store.docs.items() if not d.get("deleted"))
+    docs = [store.docs[i]["text"] for i in ids]
+    position = {fid: p for p, fid in enumerate(ids)}
+
+    def embed_fn(texts):
+        r = client.models.embed_content(model="models/text-embedding-004", contents=texts)
+        return [e.values for e in r.embeddings]
+
+    def search_fn(q, k):
+        D, I = store.index.search(q, k)
+        return D, [[position.get(i, -1) for i in row] for row in I]
+
+    return RAGService(docs, embed_fn, search_fn, gemini_stream(client))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mock", action="store_true", help="fake embedder + mock LLM")
+    parser.add_argument("--store", default="rag_store")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    service = build_mock_service() if args.mock else build_gemini_service(args.store)
+    asyncio.run(serve(service, port=args.port))
@@ -0,0 +1,139 @@
+import numpy as np
+import faiss
+
+
+# -----------------------------------
+# Retriever with selectable FAISS index type
+#
+#   flat     → IndexFlatL2, exact, O(N·d) per query
+#   ivf_flat → k-means cells, only nprobe cells are scanned
+#   hnsw     → graph search, efSearch controls accuracy/speed
+#   ivf_pq   → IVF + product quantization, smallest memory
+#
+# IVF / PQ need training → a random sample of the corpus is used
+# -----------------------------------
+
+DEFAULT_CONFIG = {
+    "type": "flat",
+    "nlist": 1024,          # IVF cells
+    "nprobe": 16,           # IVF cells scanned per query
+    "hnsw_m": 32,           # HNSW neighbours per node
+    "ef_construction": 200,
+    "ef_search": 64,
+    "pq_m": 16,             # PQ sub-vectors (dimension must divide by it)
+    "pq_bits": 8,
+    "train_size": None,     # None → 50 points per IVF cell
+    "seed": 42,
+}
+
+
+def make_config(config=None, **overrides):
+    cfg = dict(DEFAULT_CONFIG)
+    cfg.update(config or {})
+    cfg.update(overrides)
+    return cfg
+
+
+def training_sample(vectors, cfg):
+    """Random subset used to train IVF centroids / PQ codebooks."""
+    n = len(vectors)
+    size = cfg["train_size"] or 50 * cfg["nlist"]
+    if n <= size:
+        return vectors
+    rng = np.random.default_rng(cfg["seed"])
+    return vectors[np.sort(rng.choice(n, size, replace=False))]
+
+
+def build_index(dimension, config=None, train_vectors=None):
+    """
+    Empty (but trained) index for the given config.
+    Too little training data for IVF → falls back to flat.
+    """
+    cfg = make_config(config)
+    kind = cfg["type"]
+
+    if kind == "flat":
+        return faiss.IndexFlatL2(dimension)
+
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, cfg["hnsw_m"])
+        index.hnsw.efConstruction = cfg["ef_construction"]
+        index.hnsw.efSearch = cfg["ef_search"]
+        return index
+
+    if kind not in ("ivf_flat", "ivf_pq"):
+        raise ValueError(f"unknown index type: {kind}")
+
+    # faiss wants ~39+ points per centroid
+    if train_vectors is None or len(train_vectors) < 39 * cfg["nlist"]:
+        print(f"[retriever] not enough vectors to train {kind} "
+              f"(nlist={cfg['nlist']}) → using flat index")
+        return faiss.IndexFlatL2(dimension)
+
+    quantizer = faiss.IndexFlatL2(dimension)
+    if kind == "ivf_flat":
+        index = faiss.IndexIVFFlat(quantizer, dimension, cfg["nlist"])
+    else:
+        index = faiss.IndexIVFPQ(quantizer, dimension, cfg["nlist"], cfg["pq_m"], cfg["pq_bits"])
+
+    index.train(np.ascontiguousarray(training_sample(train_vectors, cfg), dtype="float32"))
+    index.nprobe = cfg["nprobe"]
+    return index
+
+
+def _unwrap(index):
+    inner = index
+    while isinstance(inner, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        inner = faiss.downcast_index(inner.index)
+    return faiss.downcast_index(inner)
+
+
+def search_params(index, sel):
+    """
+    Per-query SearchParameters with an id selector. The params type must
+    match the inner index and carries its current nprobe / efSearch
+    (the IVF / HNSW defaults would otherwise override tune()).
+    """
+    inner = _unwrap(index)
+    if isinstance(inner, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=sel, nprobe=inner.nprobe)
+    if isinstance(inner, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=sel, efSearch=inner.hnsw.efSearch)
+    return faiss.SearchParameters(sel=sel)
+
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """Tune nprobe / efSearch, also through IndexIDMap wrappers."""
+    inner = _unwrap(index)
+
+    if nprobe is not None and isinstance(inner, faiss.IndexIVF):
+        inner.nprobe = nprobe
+    if ef_search is not None and isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = ef_search
+
+
+class Retriever:
+
+    def __init__(self, config=None, **overrides):
+        self.config = make_config(config, **overrides)
+        self.index = None
+
+    def build(self, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        self.index = build_index(vectors.shape[1], self.config, train_vectors=vectors)
+        self.index.add(vectors)
+        return self
+
+    def tune(self, nprobe=None, ef_search=None):
+        set_search_params(self.index, nprobe, ef_search)
+        return self
+
+    def search(self, query_vectors, k=2):
+        q = np.ascontiguousarray(query_vectors, dtype="float32")
+        if q.ndim == 1:
+            q = q[None, :]
+        return self.index.search(q, k)
+
+    @property
+    def ntotal(self):
+        return 0 if self.index is None else self.index.ntotal
@@ -1,8 +1,10 @@
 import pandas as pd
 import google.generativeai as genai 
-from sklearn.metrics.pairwise import cosine_similarity
 import os
 
+from embedding_cache import get_cache
+from quantized_store import QuantizedStore
+
 
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 model = genai.GenerativeModel("models/gemini-pro-latest")
@@ -16,18 +18,28 @@ df = pd.DataFrame({
     ]
 })
 
-# Create embeddings
-df["embedding"] = df.feedback.apply(lambda x:
+# Create embeddings (cached → re-runs over the same feedback make no API calls)
+embed = get_cache().cached("text-embedding-004", lambda x:
     genai.embed_content(model="text-embedding-004", content=x)["embedding"]
 )
 
+# packed int8 codes in RAM: 1 byte per dimension, 4x smaller than a float32
+# matrix (Python lists of floats in an object column take ~32 bytes each).
+# The exact float32 vectors for re-scoring live in a memory-mapped .npy file,
+# so only the pages of the top candidates are read.
+store = QuantizedStore(df.feedback.apply(embed), mode="int8",
+                       float32_path="feedback_embeddings.npy")
+memory = store.memory_bytes()
+print("Embedding memory:", memory,
+      f"(float32 matrix would be {store.exact.nbytes} bytes)")
+
 # Query
 query = "delivery issues"
-q_emb = genai.embed_content(model="text-embedding-004", content=query)["embedding"]
+q_emb = embed(query)
 
-# Similarity
-df["similarity"] = df.embedding.apply(
-    lambda x: cosine_similarity([x], [q_emb])[0][0]
-)
+# Similarity: coarse int8 pass → exact float32 re-scoring
+idx, sims = store.search(q_emb, k=len(df))
 
-print(df.sort_values("similarity", ascending=False))
+results = df.iloc[idx].assign(similarity=sims)
+print(results)
+print("Embedding cache:", get_cache().stats())
@@ -0,0 +1,105 @@
+import heapq
+import itertools
+import multiprocessing as mp
+
+import numpy as np
+import faiss
+
+
+# -----------------------------------
+# Sharded multi-process vector search
+#
+#   vectors.npy (memory-mapped)
+#     ├── shard 0 → worker process 0 → IndexFlatL2
+#     ├── shard 1 → worker process 1 → IndexFlatL2
+#     └── ...
+#
+#   query batch → sent to every shard → per-shard top-k
+#   → merged into global top-k with a heap
+#
+# each worker uses one FAISS thread, so N shards ≈ N cores
+# -----------------------------------
+
+
+def _worker(conn, path, start, end, threads):
+    faiss.omp_set_num_threads(threads)
+
+    data = np.load(path, mmap_mode="r")
+    index = faiss.IndexFlatL2(data.shape[1])
+    for s in range(start, end, 1_000_000):           # add in blocks → bounded RAM spikes
+        index.add(np.ascontiguousarray(data[s:min(s + 1_000_000, end)], dtype="float32"))
+    conn.send("ready")
+
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        queries, k = msg
+        D, I = index.search(queries, k)
+        I = np.where(I == -1, -1, I + start)         # shard position → global position
+        conn.send((D, I))
+
+    conn.close()
+
+
+def merge_topk(results, k):
+    """results: [(D, I) per shard] → global (D, I) via heap merge per query."""
+    n_queries = results[0][0].shape[0]
+    D = np.full((n_queries, k), np.inf, dtype="float32")
+    I = np.full((n_queries, k), -1, dtype="int64")
+
+    for q in range(n_queries):
+        # each shard's list is already sorted → heapq.merge is O(k · log shards)
+        streams = [zip(d[q], i[q]) for d, i in results]
+        for j, (dist, idx) in enumerate(itertools.islice(heapq.merge(*streams), k)):
+            D[q, j], I[q, j] = dist, idx
+    return D, I
+
+
+class ShardedSearcher:
+
+    def __init__(self, path, n_shards=None, threads_per_shard=1):
+        # path → .npy file with float32 (N, d) vectors
+        self.path = path
+        self.n_shards = n_shards or mp.cpu_count()
+        self.threads_per_shard = threads_per_shard
+        self.workers = []
+
+    def start(self):
+        n = np.load(self.path, mmap_mode="r").shape[0]
+        bounds = np.linspace(0, n, self.n_shards + 1, dtype="int64")
+
+        ctx = mp.get_context("spawn")                # safe with FAISS / OpenMP
+        for s in range(self.n_shards):
+            parent, child = ctx.Pipe()
+            p = ctx.Process(target=_worker, daemon=True,
+                            args=(child, self.path, int(bounds[s]), int(bounds[s + 1]),
+                                  self.threads_per_shard))
+            p.start()
+            self.workers.append((p, parent))
+
+        for _, conn in self.workers:
+            conn.recv()                               # wait until every shard is built
+        return self
+
+    def search(self, queries, k=10):
+        q = np.ascontiguousarray(queries, dtype="float32")
+        if q.ndim == 1:
+            q = q[None, :]
+
+        for _, conn in self.workers:                  # fan out …
+            conn.send((q, k))
+        results = [conn.recv() for _, conn in self.workers]   # … and gather
+        return merge_topk(results, k)
+
+    def close(self):
+        for p, conn in self.workers:
+            conn.send(None)
+            p.join()
+        self.workers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
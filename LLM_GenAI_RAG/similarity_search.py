@@ -0,0 +1,69 @@
+import numpy as np
+
+
+# -----------------------------------
+# Vectorized cosine-similarity search
+#
+# embeddings are normalized once → cosine = dot product
+#   one query    → matrix @ vector
+#   many queries → matrix @ matrix.T
+# top-k with argpartition (O(N)) instead of sorting all rows
+# many queries are scored tile by tile → bounded memory
+# -----------------------------------
+
+
+def normalize_rows(x):
+    x = np.ascontiguousarray(x, dtype="float32")
+    if x.ndim == 1:
+        x = x[None, :]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def top_k(scores, k):
+    """Indices of the k largest scores per row, best first."""
+    k = min(k, scores.shape[-1])
+    idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    part = np.take_along_axis(scores, idx, axis=-1)
+    order = np.argsort(-part, axis=-1)
+    return np.take_along_axis(idx, order, axis=-1)
+
+
+class CosineSearch:
+
+    def __init__(self, embeddings):
+        # list / pandas column of vectors → one (N, d) float32 block
+        if not isinstance(embeddings, np.ndarray) or embeddings.dtype == object:
+            embeddings = np.stack([np.asarray(e, dtype="float32") for e in embeddings])
+        self.matrix = normalize_rows(embeddings)    # rows of unit length
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def scores(self, query):
+        """Cosine similarity of every row with one query → (N,)."""
+        return self.matrix @ normalize_rows(query)[0]
+
+    def search(self, query, k=10):
+        """(indices, similarities) of the k best rows for one query."""
+        s = self.scores(query)
+        idx = top_k(s, k)
+        return idx, s[idx]
+
+    def search_batch(self, queries, k=10):
+        """(indices, similarities), both shaped (n_queries, k)."""
+        s = normalize_rows(queries) @ self.matrix.T
+        idx = top_k(s, k)
+        return idx, np.take_along_axis(s, idx, axis=1)
+
+    def iter_search_batch(self, queries, k=10, max_tile_bytes=64 * 2**20):
+        """
+        Tiled search_batch for many queries: yields (first query position,
+        indices, similarities) per tile so the (queries × rows) score block
+        never exceeds max_tile_bytes.
+        """
+        Q = normalize_rows(queries)
+        tile = max(1, max_tile_bytes // (4 * max(len(self), 1)))
+        for s in range(0, len(Q), tile):
+            yield (s, *self.search_batch(Q[s:s + tile], k))
@@ -0,0 +1,285 @@
+import os
+import json
+import hashlib
+import numpy as np
+import faiss
+
+from retriever import build_index, set_search_params
+
+
+# -----------------------------------
+# Persistent FAISS index + document mapping
+#
+#   store/
+#     index.faiss   → vectors (IndexIDMap2 over a flat / hnsw retriever index;
+#                     IVF indexes keep the ids themselves + a hashtable direct map)
+#     docs.jsonl    → append-only log: faiss id → {doc id, content hash, text, version}
+#                     (save() appends only what changed since the last save)
+#
+# Only new / changed documents are embedded on each run; with content-hash
+# ids, docs missing from the current list are removed (prune).
+# The index is memory-mapped on load (flat / hnsw codes via MMAP_IFC,
+# IVF inverted lists via MMAP), so a big corpus is queryable without
+# reading every vector into RAM first.
+# -----------------------------------
+
+INDEX_FILE = "index.faiss"
+DOCS_FILE = "docs.jsonl"
+LEGACY_DOCS_FILE = "docs.json"      # whole mapping in one file (older stores)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PersistentIndex:
+
+    def __init__(self, path, dimension=None, mmap=True, index_config=None):
+        self.path = path
+        self.index_config = index_config    # see retriever.DEFAULT_CONFIG
+        self.index_path = os.path.join(path, INDEX_FILE)
+        self.docs_path = os.path.join(path, DOCS_FILE)
+
+        self.index = None
+        self.dimension = dimension
+        self.docs = {}          # faiss id → {"id", "hash", "text", "version"}
+        self.by_doc_id = {}     # doc id → faiss id
+        self.next_id = 0
+        self.writable = True
+
+        # changes since the last save → appended to docs.jsonl
+        self._dirty = set()
+        self._removed = set()
+        self._rewrite = False   # full rewrite of the log (e.g. after compaction)
+
+        if os.path.exists(self.index_path):
+            self._load(mmap)
+
+    # ---- load / save ----
+    def _mmap_flags(self):
+        # IVF (fourcc "Iw..") → inverted lists mapped from the file;
+        # flat / hnsw codes (incl. inside IndexIDMap2) only map with MMAP_IFC
+        with open(self.index_path, "rb") as f:
+            if f.read(2) == b"Iw":
+                return faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        return faiss.IO_FLAG_MMAP_IFC
+
+    def _load(self, mmap):
+        self.index = faiss.read_index(self.index_path, self._mmap_flags() if mmap else 0)
+        self.dimension = self.index.d
+        self.writable = not mmap
+
+        if os.path.exists(self.docs_path):
+            self._replay_log()
+        else:
+            with open(os.path.join(self.path, LEGACY_DOCS_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.next_id = meta["next_id"]
+            self.docs = {int(k): v for k, v in meta["docs"].items()}
+            self._rewrite = True
+
+        # a crash between the log append and the index write can leave
+        # docs without vectors → keep only what the index really holds
+        live = self._stored_ids()
+        if live is not None:
+            live = set(live.tolist())
+            self.docs = {fid: d for fid, d in self.docs.items() if fid in live}
+            self.next_id = max([self.next_id] + [fid + 1 for fid in live])
+
+        self.by_doc_id = {v["id"]: k for k, v in self.docs.items() if not v.get("deleted")}
+
+    def _replay_log(self):
+        with open(self.docs_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    break                   # torn last line of an interrupted append
+                if "next_id" in rec:
+                    self.next_id = rec["next_id"]
+                elif rec.get("removed"):
+                    self.docs.pop(rec["fid"], None)
+                else:
+                    self.docs[rec["fid"]] = rec["doc"]
+
+    def _ensure_writable(self, vectors):
+        # a memory-mapped index is read-only → reload it fully before adding
+        if self.index is None:
+            # first batch doubles as IVF / PQ training data
+            # (hnsw has no remove_ids → changed docs need flat / ivf)
+            inner = build_index(self.dimension, self.index_config, train_vectors=vectors)
+            if isinstance(inner, faiss.IndexIVF):
+                # IVF stores ids natively; inside IndexIDMap2, remove_ids
+                # compacts the id map but not the IVF lists → wrong ids
+                inner.set_direct_map_type(faiss.DirectMap.Hashtable)
+                self.index = inner
+            else:
+                self.index = faiss.IndexIDMap2(inner)
+        elif not self.writable:
+            self.index = faiss.read_index(self.index_path)
+        self.writable = True
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+
+        # metadata first: only the changes are appended; _load drops entries
+        # whose vector never made it into index.faiss
+        if self._rewrite or not os.path.exists(self.docs_path):
+            tmp_docs = self.docs_path + ".tmp"
+            with open(tmp_docs, "w", encoding="utf-8") as f:
+                self._write_records(f, self.docs)
+            os.replace(tmp_docs, self.docs_path)
+        elif self._dirty or self._removed:
+            with open(self.docs_path, "a", encoding="utf-8") as f:
+                for fid in self._removed:
+                    f.write(json.dumps({"fid": fid, "removed": True}) + "\n")
+                self._write_records(f, self._dirty)
+        self._dirty, self._removed, self._rewrite = set(), set(), False
+
+        # write to a temp file first so a crash never leaves half an index
+        tmp_index = self.index_path + ".tmp"
+        faiss.write_index(self.index, tmp_index)
+        os.replace(tmp_index, self.index_path)
+
+    def _write_records(self, f, fids):
+        for fid in fids:
+            if fid in self.docs:
+                f.write(json.dumps({"fid": fid, "doc": self.docs[fid]}) + "\n")
+        f.write(json.dumps({"next_id": self.next_id}) + "\n")
+
+    # ---- add ----
+    def add_documents(self, texts, embed_fn, ids=None, prune=None):
+        """
+        Embed and add only the texts that are new or changed.
+        embed_fn(list_of_texts) → list/array of vectors.
+        ids defaults to the content hash, i.e. identical text is stored once.
+        prune: texts is the whole corpus → stored docs whose id is not in ids
+        are removed. Defaults to True with content-hash ids (an edited doc
+        gets a new id, its old text must go), False with explicit ids
+        (e.g. ingest adds one batch at a time).
+        Returns the number of documents embedded + removed.
+        """
+        if prune is None:
+            prune = ids is None
+        if ids is None:
+            ids = [content_hash(t) for t in texts]
+
+        pending_ids, pending_texts, pending_hashes, versions = [], [], [], []
+        stale = []
+
+        # one entry per doc id (the same text twice → one vector; last text wins)
+        for doc_id, text in dict(zip(ids, texts)).items():
+            h = content_hash(text)
+            old = self.by_doc_id.get(doc_id)
+            if old is not None:
+                if self.docs[old]["hash"] == h:
+                    continue
+                stale.append(old)            # changed → replace vector
+            pending_ids.append(doc_id)
+            pending_texts.append(text)
+            pending_hashes.append(h)
+            versions.append(self.docs[old].get("version", 1) + 1 if old is not None else 1)
+
+        gone = []
+        if prune:
+            keep = set(ids)
+            gone = [fid for doc_id, fid in self.by_doc_id.items() if doc_id not in keep]
+        stale += gone
+
+        if not pending_texts and not stale:
+            return 0
+
+        vectors = None
+        if pending_texts:
+            vectors = np.asarray(embed_fn(pending_texts), dtype="float32")
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+
+        self._ensure_writable(vectors)
+
+        if stale:
+            self._retire(stale)
+
+        if pending_texts:
+            new_ids = np.arange(self.next_id, self.next_id + len(pending_texts), dtype="int64")
+            self.index.add_with_ids(vectors, new_ids)
+            self.next_id += len(pending_texts)
+
+            for fid, doc_id, text, h, v in zip(new_ids.tolist(), pending_ids, pending_texts,
+                                               pending_hashes, versions):
+                self.docs[fid] = {"id": doc_id, "hash": h, "text": text, "version": v}
+                self.by_doc_id[doc_id] = fid
+                self._dirty.add(fid)
+
+        return len(pending_texts) + len(gone)
+
+    def _retire(self, fids):
+        # old versions of changed docs → removed right away
+        self._remove_ids(fids)
+        for fid in fids:
+            del self.by_doc_id[self.docs.pop(fid)["id"]]
+            self._dirty.discard(fid)
+            self._removed.add(fid)
+
+    # ---- search ----
+    def tune(self, nprobe=None, ef_search=None):
+        set_search_params(self.index, nprobe, ef_search)
+
+    def search(self, query_vectors, k=2):
+        """Returns (distances, [[doc, doc, ...] per query])."""
+        q = np.asarray(query_vectors, dtype="float32")
+        if q.ndim == 1:
+            q = q[None, :]
+
+        D, I = self.index.search(q, k)
+        results = [[dict(self.docs[i], fid=int(i)) for i in row if i in self.docs] for row in I]
+        return D, results
+
+    def get_vectors(self, fids):
+        """
+        Stored vectors for faiss ids (e.g. to re-rank search results).
+        IVF-PQ returns the PQ approximation, not the original vector.
+        """
+        fids = [int(i) for i in fids]
+        if not fids:
+            return np.empty((0, self.dimension or 0), dtype="float32")
+        self._ensure_direct_map()
+        return np.stack([self.index.reconstruct(i) for i in fids])
+
+    def _ivf(self):
+        inner = faiss.downcast_index(self.index.index) if hasattr(self.index, "id_map") else self.index
+        return inner if isinstance(inner, faiss.IndexIVF) else None
+
+    def _stored_ids(self):
+        """faiss ids actually in the index (None if the index can't list them)."""
+        if hasattr(self.index, "id_map"):
+            return faiss.vector_to_array(self.index.id_map)
+        if isinstance(self.index, faiss.IndexIVF):
+            lists = self.index.invlists
+            return np.concatenate([np.zeros(0, dtype="int64")] + [
+                faiss.rev_swig_ptr(lists.get_ids(l), lists.list_size(l)).copy()
+                for l in range(lists.nlist) if lists.list_size(l)
+            ])
+        return None
+
+    def _ensure_direct_map(self):
+        # IVF can only reconstruct through a direct map (stores written
+        # before it existed get one here, O(n) once)
+        ivf = self._ivf()
+        if ivf is not None and ivf.direct_map.type == faiss.DirectMap.NoMap:
+            ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+
+    def _remove_ids(self, fids):
+        ids = np.ascontiguousarray(fids, dtype="int64")
+        if isinstance(self.index, faiss.IndexIVF):
+            # hashtable direct map only accepts an IDSelectorArray
+            self.index.remove_ids(faiss.IDSelectorArray(len(ids), faiss.swig_ptr(ids)))
+            return
+        ivf = self._ivf()
+        if ivf is not None and ivf.direct_map.type != faiss.DirectMap.NoMap:
+            ivf.set_direct_map_type(faiss.DirectMap.NoMap)     # older IDMap2-wrapped IVF stores
+        self.index.remove_ids(ids)
+
+    @property
+    def ntotal(self):
+        return 0 if self.index is None else self.index.ntotal
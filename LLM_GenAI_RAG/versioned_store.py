@@ -0,0 +1,152 @@
+import threading
+
+import numpy as np
+import faiss
+
+from retriever import search_params
+from vector_store import PersistentIndex
+
+
+# -----------------------------------
+# Versioned document store with tombstones
+#
+#   update → new version gets a new faiss id, old one is tombstoned
+#   delete → tombstoned
+#   search → tombstoned ids are excluded inside faiss (IDSelectorNot)
+#   compaction (remove_ids) runs in a background thread once the
+#   deleted fraction crosses compact_threshold
+#
+# a corpus that changes 1% a day only ever re-embeds that 1%
+# -----------------------------------
+
+
+class VersionedStore(PersistentIndex):
+
+    def __init__(self, path, compact_threshold=0.2, background=True, **kwargs):
+        self.lock = threading.RLock()
+        self.compact_threshold = compact_threshold
+        self.background = background
+        self._compactor = None
+        self._exclude = None    # selector over the tombstones, rebuilt when they change
+
+        super().__init__(path, **kwargs)
+        self.tombstones = {fid for fid, d in self.docs.items() if d.get("deleted")}
+
+    # ---- writes ----
+    def _retire(self, fids):
+        # lazy: keep the vector, just mark it dead
+        for fid in fids:
+            doc = self.docs[fid]
+            doc["deleted"] = True
+            self.tombstones.add(fid)
+            self._exclude = None
+            self._dirty.add(fid)
+            if self.by_doc_id.get(doc["id"]) == fid:
+                del self.by_doc_id[doc["id"]]
+
+    def add_documents(self, texts, embed_fn, ids=None, prune=None):
+        """Insert new docs, new versions of changed docs; unchanged ones are skipped."""
+        with self.lock:
+            added = super().add_documents(texts, embed_fn, ids, prune)
+        self._maybe_compact()
+        return added
+
+    def delete(self, doc_ids):
+        removed = 0
+        with self.lock:
+            for doc_id in doc_ids:
+                fid = self.by_doc_id.pop(doc_id, None)
+                if fid is not None:
+                    self._retire([fid])
+                    removed += 1
+        self._maybe_compact()
+        return removed
+
+    def save(self):
+        with self.lock:
+            super().save()
+
+    # ---- reads ----
+    def search(self, query_vectors, k=2):
+        """Like PersistentIndex.search, tombstoned versions never come back."""
+        q = np.asarray(query_vectors, dtype="float32")
+        if q.ndim == 1:
+            q = q[None, :]
+
+        with self.lock:
+            params = None
+            if self.tombstones:
+                params = search_params(self.index, self._tombstone_selector())
+            D, I = self.index.search(q, k, params=params)
+
+            out_D = np.full((len(q), k), np.inf, dtype="float32")
+            results = []
+            for r, (drow, irow) in enumerate(zip(D, I)):
+                live = [(d, i) for d, i in zip(drow, irow) if i in self.docs]
+                out_D[r, :len(live)] = [d for d, _ in live]
+                results.append([dict(self.docs[i], fid=int(i)) for _, i in live])
+
+        return out_D, results
+
+    def _tombstone_selector(self):
+        # built once per change of the tombstone set, not per query
+        if self._exclude is None:
+            dead = np.fromiter(self.tombstones, dtype="int64", count=len(self.tombstones))
+            batch = faiss.IDSelectorBatch(len(dead), faiss.swig_ptr(dead))
+            self._exclude = (faiss.IDSelectorNot(batch), batch)   # Not only borrows batch
+        return self._exclude[0]
+
+    def get_vectors(self, fids):
+        # compaction may be running remove_ids on the same index
+        with self.lock:
+            return super().get_vectors(fids)
+
+    @property
+    def ntotal(self):
+        with self.lock:
+            return 0 if self.index is None else self.index.ntotal
+
+    @property
+    def live_count(self):
+        with self.lock:
+            return self.ntotal - len(self.tombstones)
+
+    @property
+    def deleted_fraction(self):
+        with self.lock:
+            return len(self.tombstones) / self.ntotal if self.ntotal else 0.0
+
+    # ---- compaction ----
+    def compact(self):
+        """Physically remove tombstoned vectors and save. Returns how many."""
+        with self.lock:
+            dead = sorted(self.tombstones)
+            if not dead:
+                return 0
+
+            self._ensure_writable(None)
+            self._remove_ids(dead)
+            for fid in dead:
+                del self.docs[fid]
+            self.tombstones.clear()
+            self._exclude = None
+            self._rewrite = True            # log would mostly be dead entries
+            super().save()
+        return len(dead)
+
+    def _maybe_compact(self):
+        if self.deleted_fraction < self.compact_threshold:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if self.background:
+            # not a daemon: interpreter exit waits for it instead of killing
+            # it between the two file replaces in save()
+            self._compactor = threading.Thread(target=self.compact)
+            self._compactor.start()
+        else:
+            self.compact()
+
+    def wait_for_compaction(self):
+        if self._compactor is not None:
+            self._compactor.join()
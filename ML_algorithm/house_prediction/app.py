@@ -1,8 +1,6 @@
 import streamlit as st
-import pickle
-import json
-import numpy as np
-import os
+
+from model_registry import load_model
 
 # -------------------------------
 # Page config
@@ -47,15 +45,15 @@ st.markdown(
 )
 
 # -------------------------------
-# Load model safely (Cloud-safe)
+# Load model once (Cloud-safe)
+# st.cache_resource → unpickled on the first run only,
+# not again on every Streamlit rerun / widget change
 # -------------------------------
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-model_path = os.path.join(BASE_DIR, "model", "house_price_model.pkl")
-columns_path = os.path.join(BASE_DIR, "model", "columns.json")
+@st.cache_resource
+def get_model():
+    return load_model()
 
-model = pickle.load(open(model_path, "rb"))
-columns = json.load(open(columns_path, "r"))
+model = get_model()
 
 # -------------------------------
 # App UI
@@ -65,8 +63,7 @@ st.title("🏠 Bengaluru House Price Predictor")
 st.markdown("### Enter House Details")
 
 # Input fields
-exclude_cols = ['total_sqft', 'bath', 'bhk']
-locations = sorted([c for c in columns if c not in exclude_cols])
+locations = model.locations
 
 location = st.selectbox("📍 Location", locations)
 sqft = st.number_input("📐 Total Square Feet", min_value=300.0, step=50.0)
@@ -78,19 +75,7 @@ bhk = st.number_input("🛏️ BHK", min_value=1, step=1)
 # -------------------------------
 if st.button("Predict Price"):
     try:
-        x = np.zeros(len(columns))
-
-        x[columns.index('total_sqft')] = sqft
-        x[columns.index('bath')] = bath
-        x[columns.index('bhk')] = bhk
-
-        if location in columns:
-            x[columns.index(location)] = 1
-
-        import pandas as pd
-        x_df = pd.DataFrame([x], columns=columns)
-
-        price = model.predict(x_df)[0]
+        price = model.predict_one(location, sqft, bath, bhk)
 
         st.success(f"💰 Estimated Price: ₹ {round(price, 2)} Lakhs")
 
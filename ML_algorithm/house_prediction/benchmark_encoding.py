@@ -0,0 +1,96 @@
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from sklearn.model_selection import train_test_split
+from sklearn.linear_model import LinearRegression
+from xgboost import XGBRegressor
+
+from preprocessing import HousePreprocessor
+from feature_encoder import FeatureEncoder, CategoricalEncoder, onehot_columns
+
+
+# -----------------------------------
+# Location encoding: dense get_dummies vs CSR one-hot / native categorical
+#
+#   python benchmark_encoding.py            (full Bengaluru CSV)
+#   python benchmark_encoding.py --repeat 20
+#
+# design matrix size + fit time + R2 for both models, same split
+# -----------------------------------
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+XGB_PARAMS = dict(n_estimators=300, learning_rate=0.05, max_depth=5, random_state=42, tree_method="hist")
+
+
+def nbytes(X):
+    if isinstance(X, pd.DataFrame):
+        return int(X.memory_usage(deep=True).sum())
+    if hasattr(X, "indptr"):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+
+def fit(model, X, y, train_idx, test_idx):
+    take = (lambda idx: X.iloc[idx]) if isinstance(X, pd.DataFrame) else (lambda idx: X[idx])
+    start = time.perf_counter()
+    model.fit(take(train_idx), y[train_idx])
+    elapsed = time.perf_counter() - start
+    return elapsed, model.score(take(test_idx), y[test_idx])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark location encodings")
+    parser.add_argument("--data", default=os.path.join(BASE_DIR, "data", "bengaluru_house_data.csv"))
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.data)
+    if args.repeat > 1:
+        raw = pd.concat([raw] * args.repeat, ignore_index=True)
+
+    prep = HousePreprocessor(min_location_count=10 * args.repeat)
+    df = prep.fit_transform(raw)
+    y = df["price"].to_numpy()
+    train_idx, test_idx = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+
+    # before: dense frame with one column per location
+    start = time.perf_counter()
+    dense = pd.concat([df[["total_sqft", "bath", "bhk"]],
+                       pd.get_dummies(df["location"], drop_first=True)], axis=1).astype("float64")
+    dense_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sparse = FeatureEncoder(onehot_columns(prep.categories), prep.categories).encode(df, sparse=True).astype("float64")
+    sparse_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cat = CategoricalEncoder(prep.categories).encode(df)
+    cat_t = time.perf_counter() - start
+
+    # same design matrix: one-hot part exact, numeric part up to float32 rounding
+    a, b = sparse.toarray(), dense.to_numpy()
+    assert np.array_equal(a[:, 3:], b[:, 3:]) and np.allclose(a[:, :3], b[:, :3], rtol=1e-6), \
+        "CSR and dense one-hot differ"
+
+    print(f"{len(df)} rows, {len(prep.categories)} locations\n")
+    print(f"{'matrix':<22}{'shape':>14}{'MiB':>9}{'build s':>9}")
+    for name, X, t in [("dense get_dummies", dense, dense_t), ("CSR one-hot", sparse, sparse_t),
+                       ("categorical", cat, cat_t)]:
+        print(f"{name:<22}{str(X.shape):>14}{nbytes(X) / 2**20:9.2f}{t:9.3f}")
+
+    runs = [
+        ("LinearRegression", "dense", LinearRegression(), dense),
+        ("LinearRegression", "CSR", LinearRegression(tol=1e-12), sparse),
+        ("XGBoost", "dense", XGBRegressor(**XGB_PARAMS), dense),
+        ("XGBoost", "categorical",
+         XGBRegressor(**XGB_PARAMS, enable_categorical=True, max_cat_to_onehot=1), cat),
+    ]
+    print(f"\n{'model':<18}{'input':<13}{'fit s':>8}{'R2':>8}")
+    for name, kind, model, X in runs:
+        elapsed, r2 = fit(model, X, y, train_idx, test_idx)
+        print(f"{name:<18}{kind:<13}{elapsed:8.2f}{r2:8.3f}")
@@ -0,0 +1,69 @@
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import parse_sqft
+
+
+# -----------------------------------
+# total_sqft parsing: old row-wise convert_sqft vs vectorized parse_sqft
+#
+#   python benchmark_sqft.py --n 1000000
+#
+# synthetic strings in the formats of the Bengaluru data: plain numbers,
+# ranges, unit suffixes and junk. Reports time and how many rows each
+# parser turns into a number (the old one drops every unit value).
+# -----------------------------------
+
+def convert_sqft(x):
+    # the original parser from train_model.py
+    tokens = str(x).split('-')
+    if len(tokens) == 2:
+        return (float(tokens[0]) + float(tokens[1])) / 2
+    try:
+        return float(x)
+    except:
+        return None
+
+
+def synthetic_sqft(n, seed=42):
+    rng = np.random.default_rng(seed)
+    low = rng.integers(300, 5000, n)
+    area = np.round(rng.uniform(1, 2000, n), 2).astype(str)
+    kind = rng.choice(["plain", "range", "unit", "junk"], n, p=[0.85, 0.1, 0.04, 0.01])
+    units = rng.choice(["Sq. Meter", "Sq. Yards", "Perch", "Acres", "Cents", "Guntha", "Grounds"], n)
+
+    s = pd.Series(low.astype(str), dtype=object)
+    rng_mask, unit_mask = kind == "range", kind == "unit"
+    s[rng_mask] = s[rng_mask] + " - " + (low[rng_mask] + rng.integers(100, 800, rng_mask.sum())).astype(str)
+    s[unit_mask] = pd.Series(area[unit_mask]).str.cat(units[unit_mask]).to_numpy()
+    s[kind == "junk"] = "not available"
+    return s
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark total_sqft parsing")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    s = synthetic_sqft(args.n)
+    print(f"{len(s)} strings, {s.nunique()} distinct")
+
+    start = time.perf_counter()
+    old = s.apply(convert_sqft)
+    old_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = parse_sqft(s)
+    new_t = time.perf_counter() - start
+
+    both = old.notna() & new.notna()
+    assert np.allclose(old[both].astype(float), new[both]), "parsers disagree on plain values"
+
+    print(f"{'parser':<14}{'seconds':>9}{'parsed':>10}")
+    print(f"{'convert_sqft':<14}{old_t:9.2f}{old.notna().sum():10}")
+    print(f"{'parse_sqft':<14}{new_t:9.2f}{new.notna().sum():10}")
+    print(f"speedup: {old_t / new_t:.1f}x, "
+          f"{new.notna().sum() - old.notna().sum()} more rows kept (unit values)")
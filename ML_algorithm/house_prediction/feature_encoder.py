@@ -0,0 +1,203 @@
+import os
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+# -----------------------------------
+# Compiled feature encoder for house price inference
+#
+# built once from columns.json:
+#   column → position dict   (no columns.index(...) scans)
+#   numeric positions array
+#   reusable one-row buffer (CategoricalEncoder: one-row frame) for single predictions
+#
+# bulk input (DataFrame / CSV / JSON list) → dense or CSR design matrix
+# in one vectorized pass
+#
+# note: XGBoost treats entries missing from a CSR matrix as "missing",
+# not 0 → a model trained on dense data must be served dense
+#
+# CategoricalEncoder: same interface, 4 columns with location as a pandas
+# category → XGBoost enable_categorical, no one-hot at all.
+# columns.json says which one a model needs ("location" column or not).
+# -----------------------------------
+
+NUMERIC_COLS = ["total_sqft", "bath", "bhk"]
+LOCATION = "location"
+OTHER = "other"
+
+
+class FeatureEncoder:
+
+    def __init__(self, columns, categories=None):
+        self.columns = list(columns)
+        self.n_features = len(self.columns)
+        self.position = {c: i for i, c in enumerate(self.columns)}
+
+        self.numeric_pos = np.array([self.position[c] for c in NUMERIC_COLS], dtype="int64")
+
+        # location → column, -1 for the dropped base location (no one-hot)
+        if categories is not None:
+            # full category list (from the preprocessor) → base location is
+            # known, truly unseen locations → the "other" bucket they were trained as
+            self.loc_pos = {c: self.position.get(c, -1) for c in categories}
+            self.other_pos = self.loc_pos.get(OTHER, -1)
+        else:
+            # columns only → base and unseen can't be told apart → no one-hot
+            self.loc_pos = {c: p for c, p in self.position.items() if c not in NUMERIC_COLS}
+            self.other_pos = -1
+        self.locations = sorted(self.loc_pos)
+
+        self._row = np.zeros((1, self.n_features), dtype="float32")
+        self._last_loc = None
+
+    @classmethod
+    def from_json(cls, path, categories=None):
+        with open(path, "r") as f:
+            return cls(json.load(f), categories)
+
+    def location_index(self, locations):
+        """Column position per location, -1 for the base one, "other" (or -1) for unknown ones."""
+        codes = pd.Series(locations).map(self.loc_pos)
+        return codes.fillna(self.other_pos).to_numpy(dtype="int64")
+
+    # ---- one house: reuses the same buffer ----
+    def encode_one(self, location, total_sqft, bath, bhk):
+        row = self._row
+        if self._last_loc is not None:
+            row[0, self._last_loc] = 0          # clear previous one-hot
+            self._last_loc = None
+
+        row[0, self.numeric_pos] = (total_sqft, bath, bhk)
+
+        loc = self.loc_pos.get(location, self.other_pos)
+        if loc >= 0:
+            row[0, loc] = 1
+            self._last_loc = loc
+        return row
+
+    # ---- many houses ----
+    def encode(self, houses, sparse=False):
+        """
+        houses: DataFrame, list of dicts or dict of lists with
+        location, total_sqft, bath, bhk → (n, n_features) matrix.
+        Unknown locations go to "other" when the categories are known,
+        the base location (and, without categories, unknown ones) get no one-hot.
+        """
+        df = houses if isinstance(houses, pd.DataFrame) else pd.DataFrame(houses)
+        n = len(df)
+
+        numeric = df[NUMERIC_COLS].to_numpy(dtype="float32")
+        loc = self.location_index(df["location"])
+        known = loc >= 0
+
+        if sparse:
+            from scipy.sparse import csr_matrix
+
+            # per row: 3 numeric entries + 1 location entry if known
+            counts = 3 + known.astype("int64")
+            indptr = np.concatenate([[0], np.cumsum(counts)])
+            indices = np.empty(indptr[-1], dtype="int64")
+            data = np.empty(indptr[-1], dtype="float32")
+
+            starts = indptr[:-1]
+            for j in range(3):
+                indices[starts + j] = self.numeric_pos[j]
+                data[starts + j] = numeric[:, j]
+            indices[starts[known] + 3] = loc[known]
+            data[starts[known] + 3] = 1
+
+            return csr_matrix((data, indices, indptr), shape=(n, self.n_features))
+
+        X = np.zeros((n, self.n_features), dtype="float32")
+        X[:, self.numeric_pos] = numeric
+        X[np.flatnonzero(known), loc[known]] = 1
+        return X
+
+
+class CategoricalEncoder:
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self.columns = NUMERIC_COLS + [LOCATION]
+        self.n_features = len(self.columns)
+        self.locations = sorted(self.categories)
+
+        self._index = pd.Index(self.categories)
+        self._dtype = pd.CategoricalDtype(self.categories)
+        self.other_code = self._index.get_loc(OTHER) if OTHER in self._index else -1
+        self._code = {c: i for i, c in enumerate(self.categories)}
+
+        # reusable one-row frame for single predictions (fixed dtypes, values set in place)
+        self._row = self.encode({LOCATION: [self.categories[0]], "total_sqft": [0.0], "bath": [0.0], "bhk": [0.0]})
+        self._loc_col = self.columns.index(LOCATION)
+
+    def location_index(self, locations):
+        """Category code per location, "other" (or -1) for unknown ones."""
+        codes = self._index.get_indexer(pd.Series(locations))
+        codes[codes < 0] = self.other_code
+        return codes
+
+    def encode_one(self, location, total_sqft, bath, bhk):
+        row = self._row
+        for j, value in enumerate((total_sqft, bath, bhk)):
+            row.iat[0, j] = value
+        code = self._code.get(location, self.other_code)
+        row.iat[0, self._loc_col] = self.categories[code] if code >= 0 else np.nan
+        return row
+
+    def encode(self, houses):
+        """houses → DataFrame: float32 numeric columns + location category."""
+        df = houses if isinstance(houses, pd.DataFrame) else pd.DataFrame(houses)
+        X = pd.DataFrame(df[NUMERIC_COLS].to_numpy(dtype="float32"), columns=NUMERIC_COLS)
+        X[LOCATION] = pd.Categorical.from_codes(self.location_index(df[LOCATION]), dtype=self._dtype)
+        return X
+
+
+def onehot_columns(categories):
+    """Columns of the one-hot layout (first category dropped, like get_dummies(drop_first=True))."""
+    return NUMERIC_COLS + sorted(categories)[1:]
+
+
+def make_encoder(columns, categories=None):
+    """Encoder matching a model's columns.json (categories from its preprocessor)."""
+    if LOCATION in columns:
+        if categories is None:
+            raise ValueError("a categorical model needs the location categories of its preprocessor")
+        return CategoricalEncoder(categories)
+    return FeatureEncoder(columns, categories)
+
+
+def load_houses(path):
+    """CSV or JSON (list of objects, or {"houses": [...]}) → DataFrame."""
+    if path.lower().endswith(".json"):
+        with open(path, "r") as f:
+            data = json.load(f)
+        return pd.DataFrame(data["houses"] if isinstance(data, dict) else data)
+    return pd.read_csv(path)
+
+
+if __name__ == "__main__":
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Encode houses into a design matrix")
+    parser.add_argument("path", help="CSV / JSON with location, total_sqft, bath, bhk")
+    parser.add_argument("--columns", default=os.path.join(BASE_DIR, "model", "columns.json"))
+    parser.add_argument("--preprocessor", default=None,
+                        help="preprocessor.json of the model → full location list")
+    parser.add_argument("--sparse", action="store_true")
+    args = parser.parse_args()
+
+    categories = None
+    if args.preprocessor:
+        from preprocessing import HousePreprocessor
+        categories = HousePreprocessor.load(args.preprocessor).categories
+    encoder = FeatureEncoder.from_json(args.columns, categories)
+    X = encoder.encode(load_houses(args.path), sparse=args.sparse)
+
+    size = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes if args.sparse else X.nbytes
+    print(f"{X.shape[0]} houses × {X.shape[1]} features, {size / 2**20:.2f} MiB "
+          f"({'CSR' if args.sparse else 'dense'})")
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import pickle
+import threading
+
+from feature_encoder import make_encoder
+from preprocessing import HousePreprocessor
+
+
+# -----------------------------------
+# Model registry
+#
+#   model/registry/
+#     v1/  model.pkl  columns.json  preprocessor.json  meta.json
+#     v2/  ...
+#     LATEST          → name of the version to serve
+#
+# load_model() keeps loaded versions in memory, so a long-running app /
+# API unpickles each version once instead of on every request.
+# The old model/house_price_model.pkl + columns.json are served as
+# version "legacy" until something is registered.
+# -----------------------------------
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, "model")
+REGISTRY_DIR = os.path.join(MODEL_DIR, "registry")
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def list_versions():
+    if not os.path.isdir(REGISTRY_DIR):
+        return []
+    versions = [v for v in os.listdir(REGISTRY_DIR) if v.startswith("v") and v[1:].isdigit()]
+    return sorted(versions, key=lambda v: int(v[1:]))
+
+
+def latest_version():
+    path = os.path.join(REGISTRY_DIR, "LATEST")
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return f.read().strip()
+    return "legacy"
+
+
+def register(model, columns, metrics=None, promote=True, preprocessor=None):
+    """Save a trained model (+ its fitted preprocessor) as the next version, returns its name."""
+    versions = list_versions()
+    version = f"v{int(versions[-1][1:]) + 1 if versions else 1}"
+    folder = os.path.join(REGISTRY_DIR, version)
+    os.makedirs(folder)
+
+    with open(os.path.join(folder, "model.pkl"), "wb") as f:
+        pickle.dump(model, f)
+    with open(os.path.join(folder, "columns.json"), "w") as f:
+        json.dump(list(columns), f)
+    if preprocessor is not None:
+        preprocessor.save(os.path.join(folder, "preprocessor.json"))
+    with open(os.path.join(folder, "meta.json"), "w") as f:
+        json.dump({
+            "version": version,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "model_type": type(model).__name__,
+            "n_features": len(columns),
+            "metrics": metrics or {},
+        }, f, indent=2)
+
+    if promote:
+        with open(os.path.join(REGISTRY_DIR, "LATEST"), "w") as f:
+            f.write(version)
+    return version
+
+
+def _artifact_paths(version):
+    folder = MODEL_DIR if version == "legacy" else os.path.join(REGISTRY_DIR, version)
+    model_name = "house_price_model.pkl" if version == "legacy" else "model.pkl"
+    return (os.path.join(folder, model_name),
+            os.path.join(folder, "columns.json"),
+            os.path.join(folder, "preprocessor.json"))
+
+
+class LoadedModel:
+
+    def __init__(self, version):
+        model_path, columns_path, preprocessor_path = _artifact_paths(version)
+        with open(model_path, "rb") as f:
+            self.model = pickle.load(f)
+        with open(columns_path, "r") as f:
+            self.columns = json.load(f)
+        self.version = version
+
+        # versions trained before the preprocessor existed expect clean input
+        self.preprocessor = (HousePreprocessor.load(preprocessor_path)
+                             if os.path.exists(preprocessor_path) else None)
+
+        # column index + buffers compiled once per loaded version
+        self.encoder = make_encoder(self.columns, self.preprocessor and self.preprocessor.categories)
+        self.locations = self.encoder.locations
+        self._one_lock = threading.Lock()
+
+    def design_matrix(self, houses):
+        """
+        houses: DataFrame / list of dicts with location, total_sqft, bath, bhk
+        (or raw listing fields like size / "1100 - 1300" when a preprocessor is saved).
+        """
+        if self.preprocessor is not None:
+            houses = self.preprocessor.transform(houses)
+        return self.encoder.encode(houses)
+
+    def predict(self, houses):
+        """One vectorized predict call for the whole batch."""
+        return self.model.predict(self.design_matrix(houses))
+
+    def predict_one(self, location, total_sqft, bath, bhk):
+        # shared one-row buffer → one request at a time
+        with self._one_lock:
+            return float(self.model.predict(self.encoder.encode_one(location, total_sqft, bath, bhk))[0])
+
+
+def load_model(version=None):
+    """Loaded model for a version (default: LATEST), cached per process."""
+    version = version or latest_version()
+    if version != "legacy" and version not in list_versions():
+        raise FileNotFoundError(f"no registered model version {version!r}")
+    with _lock:
+        if version not in _loaded:
+            _loaded[version] = LoadedModel(version)
+        return _loaded[version]
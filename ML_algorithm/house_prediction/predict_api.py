@@ -0,0 +1,66 @@
+import time
+
+from flask import Flask, jsonify, request
+
+from model_registry import load_model, list_versions, latest_version
+
+
+# -----------------------------------
+# Batch prediction API (model is loaded once, kept warm)
+#
+#   POST /predict            {"houses": [{"location": ..., "total_sqft": ...,
+#                                         "bath": ..., "bhk": ...}, ...]}
+#   POST /predict?version=v2 → a specific registered version
+#   GET  /models             → registered versions + the one being served
+#
+#   python predict_api.py
+# -----------------------------------
+
+app = Flask(__name__)
+
+REQUIRED = ["location", "total_sqft", "bath", "bhk"]
+MAX_BATCH = 100_000
+
+
+@app.route("/models")
+def models():
+    return jsonify({"latest": latest_version(), "versions": list_versions()})
+
+
+@app.route("/predict", methods=["POST"])
+def predict():
+    body = request.get_json(silent=True) or {}
+    houses = body.get("houses")
+
+    if not isinstance(houses, list) or not houses:
+        return jsonify({"error": "body must be {\"houses\": [ ... ]}"}), 400
+    if len(houses) > MAX_BATCH:
+        return jsonify({"error": f"at most {MAX_BATCH} houses per request"}), 400
+
+    missing = [f for f in REQUIRED if any(f not in h for h in houses)]
+    if missing:
+        return jsonify({"error": f"every house needs {REQUIRED}, missing: {missing}"}), 400
+
+    try:
+        model = load_model(request.args.get("version"))
+    except FileNotFoundError:
+        return jsonify({"error": "unknown model version"}), 404
+
+    start = time.perf_counter()
+    try:
+        prices = model.predict(houses)
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"invalid house data: {e}"}), 400
+    elapsed = time.perf_counter() - start
+
+    return jsonify({
+        "version": model.version,
+        "predictions": [round(float(p), 2) for p in prices],
+        "unit": "lakhs",
+        "predict_ms": round(elapsed * 1000, 2),
+    })
+
+
+if __name__ == "__main__":
+    load_model()            # warm up before the first request
+    app.run(port=5001)
@@ -0,0 +1,252 @@
+import os
+import re
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+# -----------------------------------
+# Vectorized preprocessing for the Bengaluru house data
+#
+#   size        "2 BHK" / "4 Bedroom"   → bhk        (str.extract)
+#   total_sqft  "1056" / "2100 - 2850"  → float      (one compiled regex +
+#               "34.46Sq. Meter"          → 370.9      unit conversion table)
+#   location    rare (≤ min_count rows) → "other"    (Categorical mapping)
+#
+# string parsers run once per distinct value (pd.factorize) and are
+# broadcast back → cost grows with the vocabulary, not the row count.
+# fit() learns the kept locations on the training data, the fitted state
+# is a small JSON file → the same transform runs at train and inference
+# time. No row-wise .apply, no per-row try/except.
+# -----------------------------------
+
+RAW_COLS = ["location", "size", "total_sqft", "bath", "price"]
+OTHER = "other"
+
+# square feet per unit, keyed by the unit with everything but letters removed
+UNIT_SQFT = {
+    "": 1.0, "sqft": 1.0, "sqfeet": 1.0,
+    "sqmeter": 10.7639, "sqmeters": 10.7639, "sqm": 10.7639,
+    "sqyards": 9.0, "sqyard": 9.0, "sqyd": 9.0,
+    "perch": 272.25, "perches": 272.25,
+    "acres": 43560.0, "acre": 43560.0,
+    "cents": 435.6, "cent": 435.6,
+    "guntha": 1089.0, "gunthas": 1089.0,
+    "grounds": 2400.0, "ground": 2400.0,
+}
+
+# number [unit] [- number [unit]]  e.g. "1056", "2100 - 2850", "34.46Sq. Meter"
+NUM = r"\d+(?:\.\d+)?|\.\d+"
+UNIT = r"[a-z][a-z.\s]*?"
+SQFT_PATTERN = (rf"(?i)^\s*(?P<low>{NUM})\s*(?P<unit1>{UNIT})?\s*"
+                rf"(?:-\s*(?P<high>{NUM})\s*(?P<unit2>{UNIT})?)?\s*$")
+SQFT_RE = re.compile(SQFT_PATTERN)
+BHK_RE = re.compile(r"^\s*(\d+)")
+
+
+def on_uniques(series, parse):
+    """
+    Run a vectorized string parser on the distinct values only and
+    broadcast back — listing dumps repeat the same few thousand strings.
+    """
+    codes, uniques = pd.factorize(series)
+    parsed = np.append(parse(pd.Series(uniques, dtype="string")).to_numpy(dtype="float64"), np.nan)
+    return pd.Series(parsed[codes], index=series.index, name=series.name)   # code -1 → NaN
+
+
+def _parse_bhk(size):
+    return pd.to_numeric(size.str.extract(BHK_RE, expand=False), errors="coerce")
+
+
+def _sqft_parts(s):
+    """low / high numbers (NaN when absent) + the unit written after each, one regex pass."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        # no pyarrow → same pattern through pandas (Python re, per string)
+        parts = s.str.extract(SQFT_RE)
+        return (parts["low"].astype("float64").to_numpy(), parts["high"].astype("float64").to_numpy(),
+                parts["unit1"].fillna("").to_numpy(dtype=object),
+                parts["unit2"].fillna("").to_numpy(dtype=object))
+
+    # RE2 in Arrow → the whole column is matched in C++
+    parts = pc.extract_regex(pa.array(s, type=pa.string(), from_pandas=True), SQFT_PATTERN)
+
+    def number(field):
+        text = parts.field(field)
+        return pc.cast(pc.if_else(pc.equal(text, ""), pa.scalar(None, pa.string()), text),
+                       pa.float64()).to_numpy(zero_copy_only=False)
+
+    def unit(field):
+        return pc.fill_null(parts.field(field), "").to_numpy(zero_copy_only=False)
+
+    return number("low"), number("high"), unit("unit1"), unit("unit2")
+
+
+def _unit_factor(units):
+    # looked up once per distinct unit spelling, unknown unit → NaN
+    codes, spellings = pd.factorize(units)
+    keys = pd.Series(spellings, dtype="string").str.lower().str.replace(r"[^a-z]", "", regex=True)
+    return np.append(keys.map(UNIT_SQFT).to_numpy(dtype="float64"), np.nan)[codes]
+
+
+def _parse_sqft(s):
+    low, high, unit1, unit2 = _sqft_parts(s)
+
+    # each bound in its own unit before the midpoint is taken:
+    #   "2 - 3 Acres"         → trailing unit covers the range → acres + acres
+    #   "2 Acres - 1200"      → unit belongs to the 2 only     → acres + sqft
+    #   "1 Acres - 2 Grounds" → acres + grounds
+    low_unit = np.where(unit1 == "", unit2, unit1)
+    high_unit = unit2
+    low_sqft = low * _unit_factor(low_unit)
+    high_sqft = high * _unit_factor(high_unit)
+
+    value = np.where(np.isnan(high), low_sqft, (low_sqft + high_sqft) / 2)   # range → midpoint
+    return pd.Series(value, index=s.index)
+
+
+def parse_bhk(size):
+    """ "2 BHK" / "4 Bedroom" → 2.0 / 4.0, NaN when there is no leading number."""
+    return on_uniques(size, _parse_bhk)
+
+
+def parse_sqft(total_sqft):
+    """
+    Plain numbers, "a - b" ranges (→ midpoint) and area units
+    (Sq. Meter, Sq. Yards, Perch, Acres, ...) → square feet.
+    NaN for anything unparseable or with an unknown unit.
+    """
+    return on_uniques(total_sqft, _parse_sqft)
+
+
+class HousePreprocessor:
+
+    def __init__(self, min_location_count=10, locations=None):
+        self.min_location_count = min_location_count
+        self.locations = locations          # kept locations, set by fit()
+        self.timings = {}
+
+    # ---- timing ----
+    def _stage(self, name, start):
+        now = time.perf_counter()
+        self.timings[name] = self.timings.get(name, 0.0) + now - start
+        return now
+
+    def report(self):
+        total = sum(self.timings.values())
+        for name, seconds in self.timings.items():
+            print(f"  {name:<12} {seconds * 1000:9.1f} ms")
+        print(f"  {'total':<12} {total * 1000:9.1f} ms")
+
+    # ---- cleaning shared by fit / transform ----
+    def _clean(self, df, dropna):
+        start = time.perf_counter()
+        df = df[[c for c in RAW_COLS + ["bhk"] if c in df.columns]]
+        if dropna:
+            df = df.dropna()
+        start = self._stage("select", start)
+
+        out = pd.DataFrame(index=df.index)
+        out["location"] = df["location"]
+        out["total_sqft"] = parse_sqft(df["total_sqft"])
+        start = self._stage("total_sqft", start)
+
+        out["bath"] = pd.to_numeric(df["bath"], errors="coerce")
+        out["bhk"] = pd.to_numeric(df["bhk"], errors="coerce") if "bhk" in df else parse_bhk(df["size"])
+        start = self._stage("bhk", start)
+
+        if "price" in df:
+            out["price"] = pd.to_numeric(df["price"], errors="coerce")
+        if dropna:
+            out = out.dropna()
+        self._stage("numeric", start)
+        return out
+
+    @property
+    def categories(self):
+        # sorted like pd.get_dummies → same column order as before
+        return sorted(set(self.locations) | {OTHER})
+
+    def _map_locations(self, df):
+        start = time.perf_counter()
+        categories = self.categories
+        codes = pd.Index(categories).get_indexer(df["location"])
+        codes[codes < 0] = categories.index(OTHER)       # unseen / rare → other
+        df["location"] = pd.Categorical.from_codes(codes, categories=categories)
+        self._stage("location", start)
+        return df
+
+    # ---- public API ----
+    def fit_transform(self, df):
+        """Training data → cleaned frame (invalid rows dropped), learns locations."""
+        self.timings = {}
+        out = self._clean(df, dropna=True)
+
+        start = time.perf_counter()
+        counts = out["location"].value_counts()
+        self.locations = sorted(counts.index[counts > self.min_location_count])
+        self._stage("fit", start)
+        return self._map_locations(out)
+
+    def fit(self, df):
+        self.fit_transform(df)
+        return self
+
+    def transform(self, df, dropna=False):
+        """
+        Raw listings or clean houses (location, total_sqft, bath, bhk|size)
+        → cleaned frame. Rows are kept (NaN where unparseable) unless dropna.
+        """
+        if self.locations is None:
+            raise RuntimeError("HousePreprocessor is not fitted")
+        self.timings = {}
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame(df)
+        return self._map_locations(self._clean(df, dropna=dropna))
+
+    # ---- serialization ----
+    def to_dict(self):
+        return {"min_location_count": self.min_location_count, "locations": self.locations}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["min_location_count"], state["locations"])
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+if __name__ == "__main__":
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Time the preprocessing stages")
+    parser.add_argument("--data", default=os.path.join(BASE_DIR, "data", "bengaluru_house_data.csv"))
+    parser.add_argument("--repeat", type=int, default=1, help="stack the CSV n times (e.g. 80 → ~1M rows)")
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.data)
+    if args.repeat > 1:
+        raw = pd.concat([raw] * args.repeat, ignore_index=True)
+
+    prep = HousePreprocessor()
+    start = time.perf_counter()
+    clean = prep.fit_transform(raw)
+    print(f"fit_transform: {len(raw)} → {len(clean)} rows, "
+          f"{len(prep.locations)} locations in {time.perf_counter() - start:.2f}s")
+    prep.report()
+
+    start = time.perf_counter()
+    prep.transform(raw)
+    print(f"transform: {len(raw)} rows in {time.perf_counter() - start:.2f}s")
+    prep.report()
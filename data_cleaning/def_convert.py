@@ -17,15 +17,37 @@ data = {
 
 df = pd.DataFrame(data)
 
-def convert_sqft(x):
-    tokens=x.split('-')
-    if len(tokens)==2:
-        return (float(tokens[0])+float(tokens[1]))/2
-    try:
-        return float(x)
-    except:
-        return None
-
-df['total_sqft']=df["total_sqft"].apply(convert_sqft)
-df.dropna
-print(df)
\ No newline at end of file
+# same unit table and pattern as ML_algorithm/house_prediction/preprocessing.py
+# square feet per unit, keyed by the unit with everything but letters removed
+UNIT_SQFT = {
+    "": 1.0, "sqft": 1.0, "sqfeet": 1.0,
+    "sqmeter": 10.7639, "sqmeters": 10.7639, "sqm": 10.7639,
+    "sqyards": 9.0, "sqyard": 9.0, "sqyd": 9.0,
+    "perch": 272.25, "perches": 272.25,
+    "acres": 43560.0, "acre": 43560.0,
+    "cents": 435.6, "cent": 435.6,
+    "guntha": 1089.0, "gunthas": 1089.0,
+    "grounds": 2400.0, "ground": 2400.0,
+}
+
+# number [unit] [- number [unit]]  e.g. "1056", "2100 - 2850", "34.46Sq. Meter"
+NUM = r"\d+(?:\.\d+)?|\.\d+"
+UNIT = r"[a-z][a-z.\s]*?"
+SQFT_PATTERN = (rf"(?i)^\s*(?P<low>{NUM})\s*(?P<unit1>{UNIT})?\s*"
+                rf"(?:-\s*(?P<high>{NUM})\s*(?P<unit2>{UNIT})?)?\s*$")
+
+# one pass, no per-row exceptions → square feet, rest → NaN
+parts = df["total_sqft"].str.extract(SQFT_PATTERN)
+
+
+def factor(unit):
+    return unit.fillna("").str.lower().str.replace(r"[^a-z]", "", regex=True).map(UNIT_SQFT)
+
+
+# each bound in its own unit; a trailing unit also covers the lower bound ("2 - 3 Acres")
+low = parts["low"].astype(float) * factor(parts["unit1"].fillna(parts["unit2"]))
+high = parts["high"].astype(float) * factor(parts["unit2"])
+
+df["total_sqft"] = high.add(low).div(2).fillna(low)
+df.dropna(inplace=True)
+print(df)
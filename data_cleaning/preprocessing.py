@@ -16,7 +16,9 @@ data = {
 df = pd.DataFrame(data)
 
 location_stats=df['location'].value_counts()
-df['location']=df['location'].apply(lambda x:"other" if location_stats[x]<2 else x )
+# vectorized instead of .apply(lambda x: "other" if location_stats[x] < 2 else x)
+kept=location_stats.index[location_stats>=2]
+df['location']=df['location'].where(df['location'].isin(kept),"other")
 
 dummies = pd.get_dummies(df['location'], drop_first=True)
 df = pd.concat([df.drop('location', axis=1), dummies], axis=1)
@@ -6,6 +6,7 @@ dict1={
     "price":[50,60,78,84,69,66]
 }
 df=pd.DataFrame(dict1)
-df["bhk"]=df['size'].apply(lambda x:int(x.split()[0]))
+# vectorized instead of .apply(lambda x: int(x.split()[0]))
+df["bhk"]=pd.to_numeric(df['size'].str.extract(r"^\s*(\d+)", expand=False))
 df.drop('size',axis=1,inplace=True)
 print(df.head())
\ No newline at end of file